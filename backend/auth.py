@@ -1,19 +1,28 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import os
+import time
+import asyncio
 import logging
+import threading
 from dotenv import load_dotenv
-from database import Neo4jConnection
+from database import get_shared_connection
+from cache import user_cache
+from timing import phase
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# Event stream tickets travel in the URL (and so in access logs); keep them short-lived
+EVENT_TICKET_EXPIRE_SECONDS = int(os.getenv("EVENT_TICKET_EXPIRE_SECONDS", "60"))
+EVENT_TICKET_PURPOSE = "events"
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -27,6 +36,103 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+# bcrypt releases the GIL, so a thread pool sized to the CPU count uses every core
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 4)))
+
+_password_pool = None
+_password_pending = 0
+_password_stats_lock = threading.Lock()
+password_stats = {
+    "completed": 0,
+    "rejected": 0,
+    "hash_seconds_total": 0.0,
+    "hash_seconds_max": 0.0,
+    "queue_wait_seconds_total": 0.0,
+    "queue_wait_seconds_max": 0.0,
+}
+
+def _get_password_pool() -> ThreadPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = ThreadPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+        )
+    return _password_pool
+
+def shutdown_password_pool():
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(wait=False)
+        _password_pool = None
+
+def get_password_pool_stats() -> dict:
+    """Snapshot of bcrypt pool metrics (queue depth, hash time, queue wait)"""
+    with _password_stats_lock:
+        stats = dict(password_stats)
+    stats["pending"] = _password_pending
+    stats["workers"] = PASSWORD_HASH_WORKERS
+    stats["max_pending"] = PASSWORD_HASH_MAX_PENDING
+    return stats
+
+def _timed_password_call(submitted_at: float, func, *args):
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        hash_seconds = time.perf_counter() - started
+        queue_wait = started - submitted_at
+        with _password_stats_lock:
+            password_stats["completed"] += 1
+            password_stats["hash_seconds_total"] += hash_seconds
+            password_stats["hash_seconds_max"] = max(password_stats["hash_seconds_max"], hash_seconds)
+            password_stats["queue_wait_seconds_total"] += queue_wait
+            password_stats["queue_wait_seconds_max"] = max(password_stats["queue_wait_seconds_max"], queue_wait)
+
+async def _run_password_call(func, *args):
+    """Run bcrypt work in the password pool, shedding load with 503 when the queue is full"""
+    global _password_pending
+    if _password_pending >= PASSWORD_HASH_MAX_PENDING:
+        with _password_stats_lock:
+            password_stats["rejected"] += 1
+        logger.warning(f"Password pool saturated ({_password_pending} pending) - rejecting request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    _password_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        with phase("bcrypt"):
+            return await loop.run_in_executor(
+                _get_password_pool(), _timed_password_call, time.perf_counter(), func, *args
+            )
+    finally:
+        _password_pending -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_call(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_password_call(get_password_hash, password)
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a batch of passwords across the whole pool (scripts and bulk imports)"""
+    submitted_at = time.perf_counter()
+    return list(_get_password_pool().map(
+        lambda password: _timed_password_call(submitted_at, get_password_hash, password), passwords
+    ))
+
+async def hash_passwords_async(passwords: List[str]) -> List[str]:
+    """Hash a batch at most PASSWORD_HASH_WORKERS at a time, leaving queue room for logins"""
+    hashes = []
+    for start in range(0, len(passwords), PASSWORD_HASH_WORKERS):
+        batch = passwords[start:start + PASSWORD_HASH_WORKERS]
+        hashes += await asyncio.gather(*(get_password_hash_async(password) for password in batch))
+    return hashes
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -37,46 +143,39 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_event_ticket(email: str) -> str:
+    """Short-lived token accepted only by the event stream, never as a bearer token"""
+    return create_access_token(
+        data={"sub": email, "purpose": EVENT_TICKET_PURPOSE},
+        expires_delta=timedelta(seconds=EVENT_TICKET_EXPIRE_SECONDS),
+    )
+
 def decode_access_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        with phase("jwt"):
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
 
-# Fixed database connection to avoid circular import
-_db_connection = None
-
-def get_db_connection():
-    global _db_connection
-    if _db_connection is None:
-        _db_connection = Neo4jConnection(
-            os.getenv("NEO4J_URI"),
-            os.getenv("NEO4J_USERNAME"),
-            os.getenv("NEO4J_PASSWORD")
-        )
-        _db_connection.connect()
-    return _db_connection
-
 # Simple database dependency function for use in auth functions
 def get_database_for_auth():
-    """Get database connection for auth functions"""
-    from database import Neo4jConnection
-    import os
-
-    db = Neo4jConnection(
-        os.getenv("NEO4J_URI"),
-        os.getenv("NEO4J_USERNAME"),
-        os.getenv("NEO4J_PASSWORD")
-    )
+    """Get the shared, pooled database connection for auth functions"""
+    db = get_shared_connection()
 
     # Connect if not already connected
-    if db.driver is None:
+    if not db.connected:
         db.connect()
 
     return db
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
+    return await get_user_for_token(token)
+
+async def get_event_ticket_user(ticket: str):
+    return await get_user_for_token(ticket, purpose=EVENT_TICKET_PURPOSE)
+
+async def get_user_for_token(token: str, purpose: Optional[str] = None):
+    """Resolve a JWT to its user; the token's purpose claim must match (None for access tokens)"""
     try:
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -89,16 +188,24 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             raise credentials_exception
 
         email: str = payload.get("sub")
-        if email is None:
+        if email is None or payload.get("purpose") != purpose:
             raise credentials_exception
 
+        user = user_cache.get(email)
+        if user is not None:
+            return user
+
         # Use database connection for auth
         db = get_database_for_auth()
-        user = db.get_user_by_email(email)
+        with phase("user_lookup"):
+            user = await db.get_user_by_email(email)
 
         if user is None:
             raise credentials_exception
 
+        # Never keep a principal cached past its token's expiry
+        exp = payload.get("exp")
+        user_cache.set(email, user, ttl=exp - time.time() if exp else None)
         return user
 
     except HTTPException:
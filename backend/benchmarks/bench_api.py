@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Load test: throughput and p50/p95/p99 latency of the API hot paths.
+
+Drives main.app in process over httpx's ASGI transport, so no server or
+network is involved. Install its extra dependency from the backend directory
+with ``pip install -r requirements-bench.txt``. The default backend is the in-memory Repository
+(STORAGE_BACKEND=memory), which leaves the API, auth and serialization cost
+on its own. --backend neo4j measures a real database and writes to it, so it
+also needs --database naming a scratch database other than the configured
+NEO4J_DATABASE (or "neo4j"). Seeded users and rooms are tagged with a
+bench_run property and deleted, with their bookings, tenants and
+notifications, when the run ends:
+
+  python benchmarks/bench_api.py --backend neo4j --database bench
+
+Scenarios (run in this order, each with its own fixtures):
+  login          POST /api/auth/login (bcrypt verify; concurrency capped at
+                 PASSWORD_HASH_MAX_PENDING so the pool does not shed load)
+  rooms          GET  /api/rooms?limit=50 (ETag cache path)
+  available      GET  /api/rooms/available (uncached availability query)
+  create_booking POST /api/bookings
+  approve        PUT  /api/notifications/{id} {"status": "approved"}
+  poll           GET  /api/notifications?since=<watermark> as a tenant
+
+Results are written as JSON. Use --compare to print the change against an
+earlier run, e.g. one saved on the parent commit:
+
+  python benchmarks/bench_api.py --output base.json
+  python benchmarks/bench_api.py --compare base.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from itertools import count
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND_DIR)
+
+SCENARIOS = ["login", "rooms", "available", "create_booking", "approve", "poll"]
+PASSWORD = "bench-password"
+
+TAG_QUERY = """
+MATCH (n)
+WHERE (n:Room AND n.room_number IN $room_numbers) OR (n:User AND n.email IN $emails)
+SET n.bench_run = $run
+"""
+# Everything a run created hangs off its tagged users and rooms
+CLEANUP_QUERY = """
+MATCH (n) WHERE n.bench_run = $run
+OPTIONAL MATCH (n)-[:MADE_BOOKING|FOR_ROOM|OCCUPIES|FOR_USER]-(linked)
+WHERE linked:Booking OR linked:Tenant OR linked:Notification
+OPTIONAL MATCH (linked)-[:ABOUT_BOOKING]-(about:Notification)
+WITH collect(DISTINCT n) + collect(DISTINCT linked) + collect(DISTINCT about) AS nodes
+FOREACH (node IN nodes | DETACH DELETE node)
+RETURN size(nodes) AS deleted
+"""
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, statuses, seconds):
+    latencies = sorted(latencies)
+    ms = lambda value: round(value * 1e3, 3)
+    errors = sum(1 for code in statuses if code >= 400)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "status_codes": {str(code): statuses.count(code) for code in sorted(set(statuses))},
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(len(latencies) / seconds, 1) if seconds > 0 else 0.0,
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "max_ms": ms(latencies[-1]) if latencies else 0.0,
+    }
+
+
+async def drive(make_request, total, concurrency):
+    """Issue ``total`` requests from ``concurrency`` workers; returns (latencies, statuses, seconds)"""
+    issued = count()
+    latencies, statuses = [], []
+
+    async def worker():
+        while (i := next(issued)) < total:
+            started = time.perf_counter()
+            response = await make_request(i)
+            latencies.append(time.perf_counter() - started)
+            statuses.append(response.status_code)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+class Fixtures:
+    """Seed data shared by the scenarios: rooms, tenants with tokens, an admin token"""
+
+    def __init__(self, client, db, rooms, users, tagged=False):
+        self.client = client
+        self.db = db
+        self.room_count = rooms
+        self.user_count = users
+        # Tag and later delete the seeded nodes (a shared database outlives the run)
+        self.tagged = tagged
+        self.stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        self.run_id = f"bench-{self.stamp}"
+        self.rooms = []
+        self.users = []
+        self.tokens = {}
+        self.admin_headers = None
+        self.watermarks = {}
+        # Each booking gets its own room/date slot so none is rejected as a conflict
+        self._slots = count()
+        self._first_day = date.today() + timedelta(days=1)
+        self._pending = []
+
+    async def setup(self):
+        stamp = self.stamp
+        await self.db.bulk_create_rooms([
+            {"room_number": f"B{stamp}-{i}", "room_type": "single", "capacity": 1 + i % 4,
+             "price": 5000.0 + i} for i in range(self.room_count)
+        ])
+        await self.db.bulk_create_users([
+            {"email": f"bench{i}-{stamp}@example.com", "username": f"bench{i}",
+             "password": PASSWORD, "role": "user"} for i in range(self.user_count)
+        ])
+        page = await self.db.get_all_rooms()
+        self.rooms = [room.id for room in page if room.room_number.startswith(f"B{stamp}-")]
+        self.users = [f"bench{i}-{stamp}@example.com" for i in range(self.user_count)]
+        if self.tagged:
+            await self._run_write(TAG_QUERY, room_numbers=[f"B{stamp}-{i}" for i in range(self.room_count)],
+                                  emails=self.users)
+        for email in self.users:
+            self.tokens[email] = await self.login(email, PASSWORD)
+        admin_email = os.getenv("DEFAULT_ADMIN_EMAIL", "admin@boardinghouse.com")
+        admin_password = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin123")
+        self.admin_headers = {"Authorization": f"Bearer {await self.login(admin_email, admin_password)}"}
+
+    async def login(self, email, password):
+        response = await self.client.post("/api/auth/login", data={"username": email, "password": password})
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+    async def cleanup(self):
+        """Delete the tagged nodes and what the scenarios attached to them"""
+        if not self.tagged:
+            return 0
+        return await self._run_write(CLEANUP_QUERY, "deleted")
+
+    async def _run_write(self, query, key=None, **params):
+        async def work(tx):
+            result = await tx.run(query, run=self.run_id, **params)
+            record = await result.single()
+            return record[key] if key else None
+        return await self.db._write(work)
+
+    def headers(self, i):
+        return {"Authorization": f"Bearer {self.tokens[self.users[i % len(self.users)]]}"}
+
+    def next_booking(self):
+        slot = next(self._slots)
+        start = self._first_day + timedelta(days=2 * (slot // len(self.rooms)))
+        return {"room_id": self.rooms[slot % len(self.rooms)], "start_date": start.isoformat(),
+                "end_date": (start + timedelta(days=1)).isoformat(), "duration": 1}
+
+    async def prepare_approvals(self, total):
+        """Pending booking requests for the approve scenario, created outside the timing"""
+        for i in range(total):
+            response = await self.client.post("/api/bookings", json=self.next_booking(), headers=self.headers(i))
+            response.raise_for_status()
+        notifications = await self.client.get("/api/notifications", params={"limit": 200},
+                                              headers=self.admin_headers)
+        self._pending = [n["id"] for n in notifications.json() if n["status"] == "pending"]
+        cursor = notifications.headers.get("x-next-cursor")
+        while cursor and len(self._pending) < total:
+            notifications = await self.client.get("/api/notifications", params={"limit": 200, "cursor": cursor},
+                                                  headers=self.admin_headers)
+            self._pending += [n["id"] for n in notifications.json() if n["status"] == "pending"]
+            cursor = notifications.headers.get("x-next-cursor")
+
+    # ---- One request per scenario ----
+
+    def login_request(self, i):
+        return self.client.post("/api/auth/login",
+                                data={"username": self.users[i % len(self.users)], "password": PASSWORD})
+
+    def rooms_request(self, i):
+        return self.client.get("/api/rooms", params={"limit": 50})
+
+    def available_request(self, i):
+        start = self._first_day + timedelta(days=i % 60)
+        return self.client.get("/api/rooms/available", params={
+            "start": start.isoformat(), "end": (start + timedelta(days=30)).isoformat(), "capacity": 1 + i % 4,
+        })
+
+    def create_booking_request(self, i):
+        return self.client.post("/api/bookings", json=self.next_booking(), headers=self.headers(i))
+
+    def approve_request(self, i):
+        return self.client.put(f"/api/notifications/{self._pending[i % len(self._pending)]}",
+                               json={"status": "approved"}, headers=self.admin_headers)
+
+    async def poll_request(self, i):
+        email = self.users[i % len(self.users)]
+        response = await self.client.get("/api/notifications", params={"since": self.watermarks.get(email, "")},
+                                         headers=self.headers(i))
+        self.watermarks[email] = response.headers.get("x-sync-watermark", self.watermarks.get(email, ""))
+        return response
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args):
+    import httpx
+    from main import app, db
+    from auth import PASSWORD_HASH_MAX_PENDING
+
+    async with app.router.lifespan_context(app):
+        if not db.connected:
+            raise SystemExit("❌ Storage backend is not connected")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            fixtures = Fixtures(client, db, args.rooms, args.users, tagged=args.backend == "neo4j")
+            results = {}
+            try:
+                await fixtures.setup()
+                for name in args.scenarios:
+                    total = args.requests if name != "login" else min(args.requests, args.login_requests)
+                    if name == "approve":
+                        await fixtures.prepare_approvals(total + args.warmup)
+                    make_request = getattr(fixtures, f"{name}_request")
+                    concurrency = args.concurrency
+                    if name == "login":
+                        # Past this the pool sheds logins with 503, which says nothing about latency
+                        concurrency = min(concurrency, PASSWORD_HASH_MAX_PENDING)
+                    if args.warmup:
+                        await drive(make_request, args.warmup, concurrency)
+                    latencies, statuses, seconds = await drive(make_request, total, concurrency)
+                    results[name] = summarize(latencies, statuses, seconds)
+                    print_result(name, results[name])
+            finally:
+                if fixtures.tagged:
+                    deleted = await fixtures.cleanup()
+                    print(f"🧹 Deleted {deleted} nodes tagged bench_run={fixtures.run_id}")
+    return results
+
+
+def print_result(name, result):
+    print(f"  {name:<15} {result['throughput_rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f} ms  "
+          f"p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms"
+          + (f"  ⚠️ {result['errors']} errors {result['status_codes']}" if result["errors"] else ""))
+
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\n📈 Against {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    for name, result in results.items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        change = lambda key: (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+        print(f"  {name:<15} throughput {change('throughput_rps'):+6.1f}%  p50 {change('p50_ms'):+6.1f}%  "
+              f"p95 {change('p95_ms'):+6.1f}%  p99 {change('p99_ms'):+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load test of the API hot paths")
+    parser.add_argument("--backend", choices=["memory", "neo4j"], default="memory")
+    parser.add_argument("--database", help="scratch Neo4j database for --backend neo4j (required, "
+                                           "must not be the configured NEO4J_DATABASE)")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients (default 16)")
+    parser.add_argument("--requests", type=int, default=1000, help="timed requests per scenario (default 1000)")
+    parser.add_argument("--login-requests", type=int, default=200,
+                        help="cap for the bcrypt-bound login scenario (default 200)")
+    parser.add_argument("--warmup", type=int, default=50, help="untimed requests before each scenario")
+    parser.add_argument("--rooms", type=int, default=100, help="rooms to seed (default 100)")
+    parser.add_argument("--users", type=int, default=20, help="tenant accounts to seed (default 20)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--output", default="bench_api_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    if args.backend == "neo4j":
+        from dotenv import load_dotenv
+        load_dotenv(os.path.join(BACKEND_DIR, ".env"))
+        configured = os.getenv("NEO4J_DATABASE") or "neo4j"
+        if not args.database:
+            parser.error("--backend neo4j writes to the database; pass --database with a scratch database")
+        if args.database in (configured, "neo4j", "system"):
+            parser.error(f"refusing to write benchmark data to {args.database!r}; use a scratch database")
+        os.environ["NEO4J_DATABASE"] = args.database
+    elif args.database:
+        parser.error("--database only applies to --backend neo4j")
+    os.environ["STORAGE_BACKEND"] = args.backend
+    # Per-request logs would dominate the timings; errors still get through
+    logging.disable(logging.WARNING)
+
+    print(f"📊 {args.backend} backend, {args.concurrency} concurrent clients, {args.requests} requests per scenario")
+    results = asyncio.run(run(args))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": args.backend,
+            "database": args.database,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "rooms": args.rooms,
+            "users": args.users,
+        },
+        "scenarios": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {args.output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: cost of encoding API list payloads to JSON bytes.
+
+Compares FastAPI's default path (jsonable_encoder, then stdlib json via
+JSONResponse) with ORJSONResponse rendering the converted dicts directly.
+Fixtures mirror the heaviest responses: notifications with a nested user
+and tenants with a nested room, with datetime values as _node_to_dict
+returns them.
+
+Usage: python benchmarks/bench_json_encoding.py [rows]
+"""
+import json
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+
+def make_notifications(count):
+    created = datetime(2024, 5, 1, 12, 30, 15)
+    return [
+        {
+            "id": f"notification-{i}",
+            "message": f"New booking request from user_{i} for room {100 + i % 50}",
+            "type": "booking_request",
+            "status": "pending",
+            "created_at": created,
+            "booking_id": f"booking-{i}",
+            "user": {
+                "id": f"user-{i}",
+                "email": f"user_{i}@example.com",
+                "username": f"user_{i}",
+                "role": "user",
+                "created_at": created,
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def make_tenants(count):
+    created = datetime(2024, 3, 15, 8, 0, 0)
+    return [
+        {
+            "id": f"tenant-{i}",
+            "name": f"Tenant {i}",
+            "email": f"tenant_{i}@example.com",
+            "phone": f"+63 900 000 {i:04d}",
+            "created_at": created,
+            "room": {
+                "id": f"room-{i % 50}",
+                "room_number": str(100 + i % 50),
+                "room_type": "Double",
+                "capacity": 2,
+                "price": 6500.0,
+                "status": "occupied",
+                "created_at": created,
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def render_default(content):
+    """What FastAPI does for a route returning dicts with the default class"""
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def render_orjson(content):
+    """ORJSONResponse on the converted dicts, no encoder pass"""
+    return ORJSONResponse(content).body
+
+
+def render_orjson_encoded(content):
+    """ORJSONResponse behind jsonable_encoder (FastAPI's path for undeclared routes)"""
+    return ORJSONResponse(jsonable_encoder(content)).body
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = 5
+    fixtures = {
+        "notifications": make_notifications(count),
+        "tenants": make_tenants(count),
+    }
+    variants = [
+        ("jsonable_encoder + json", render_default),
+        ("jsonable_encoder + orjson", render_orjson_encoded),
+        ("orjson direct", render_orjson),
+    ]
+
+    print(f"📊 {count} rows per payload, best of {repeat}")
+    for name, content in fixtures.items():
+        assert json.loads(render_default(content)) == json.loads(render_orjson(content))
+        baseline = None
+        print(f"  {name} ({len(render_orjson(content)) / 1024:.0f} KiB):")
+        for label, render in variants:
+            best = min(timeit.repeat(lambda: render(content), number=1, repeat=repeat))
+            baseline = baseline or best
+            print(f"    {label:<26} {best * 1e3:7.2f} ms  ({baseline / best:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
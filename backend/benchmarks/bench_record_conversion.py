@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-row cost of turning Neo4j node properties into plain dicts.
+
+Compares the original recursive `_convert_neo4j_types` (str(type) substring test
+on every leaf) with the type-dispatch `_node_to_dict` used by database.py.
+
+Usage: python benchmarks/bench_record_conversion.py [rows]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from neo4j.time import DateTime
+from database import _node_to_dict
+
+
+def legacy_convert(data):
+    """The pre-dispatch implementation, kept here as the baseline"""
+    if isinstance(data, dict):
+        return {key: legacy_convert(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [legacy_convert(item) for item in data]
+    elif hasattr(data, '__class__') and 'neo4j.time' in str(data.__class__):
+        return data.to_native()
+    else:
+        return data
+
+
+def make_rows(count):
+    """Notification-shaped property maps, as the driver hands them back"""
+    created = DateTime(2024, 5, 1, 12, 30, 15)
+    return [
+        {
+            "id": f"notification-{i}",
+            "message": f"New booking request from user_{i}",
+            "type": "booking_request",
+            "status": "pending",
+            "created_at": created,
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rows = make_rows(count)
+    assert [legacy_convert(dict(r)) for r in rows] == [_node_to_dict(r) for r in rows]
+
+    repeat = 5
+    legacy = min(timeit.repeat(lambda: [legacy_convert(dict(r)) for r in rows], number=1, repeat=repeat))
+    fast = min(timeit.repeat(lambda: [_node_to_dict(r) for r in rows], number=1, repeat=repeat))
+
+    print(f"📊 {count} rows, best of {repeat}")
+    print(f"  legacy _convert_neo4j_types: {legacy / count * 1e6:.2f} µs/row")
+    print(f"  _node_to_dict:               {fast / count * 1e6:.2f} µs/row")
+    print(f"  speedup: {legacy / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Bulk import parsing: CSV or JSON Lines in, validated row dicts out.
+
+Shared by the admin upload endpoints and init_database.py. Rows are validated
+against the Pydantic create models, then written by the bulk_create_* database
+methods in chunks of BULK_CHUNK_SIZE. CSV files need a header row and one
+record per line.
+"""
+import codecs
+import csv
+import json
+import time
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
+from pydantic import ValidationError
+
+from models import RoomCreate, UserCreate, TenantImport
+
+IMPORT_MODELS = {
+    "rooms": RoomCreate,
+    "users": UserCreate,
+    "tenants": TenantImport,
+}
+
+# Only the first few bad rows are echoed back; the rest are just counted
+MAX_REPORTED_ERRORS = 20
+UPLOAD_READ_BYTES = 64 * 1024
+
+
+def import_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """Pick "csv" or "jsonl" from the upload's file name or content type"""
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith((".jsonl", ".ndjson")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "jsonl"
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    raise ValueError("Upload must be a .csv or .jsonl file")
+
+
+class ImportReport:
+    """Running totals for one import, across all of its chunks"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.submitted = 0
+        self.created = 0
+        self.invalid = 0
+        self.errors: List[str] = []
+
+    def add_error(self, line_number: int, message: str):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"line {line_number}: {message}")
+
+    def add_result(self, result: Dict):
+        self.submitted += result["submitted"]
+        self.created += result["created"]
+
+    def as_dict(self) -> Dict:
+        seconds = time.perf_counter() - self.started
+        rows = self.submitted + self.invalid
+        return {
+            "submitted": self.submitted,
+            "created": self.created,
+            "skipped": self.submitted - self.created,
+            "invalid": self.invalid,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(rows / seconds, 1) if seconds > 0 else 0.0,
+            "errors": self.errors,
+        }
+
+
+class RowParser:
+    """Turns CSV or JSONL lines, fed one at a time, into validated row dicts"""
+
+    def __init__(self, kind: str, fmt: str, report: ImportReport):
+        self.model = IMPORT_MODELS[kind]
+        self.fmt = fmt
+        self.report = report
+        self.header = None
+        self.line_number = 0
+
+    def parse(self, line: str) -> Optional[Dict]:
+        self.line_number += 1
+        if not line.strip():
+            return None
+        try:
+            if self.fmt == "jsonl":
+                raw = json.loads(line)
+            else:
+                values = next(csv.reader([line]))
+                if self.header is None:
+                    self.header = [value.strip() for value in values]
+                    return None
+                # Empty cells mean "not given", so model defaults apply
+                raw = {key: value for key, value in zip(self.header, values) if value != ""}
+            return self.model.model_validate(raw).model_dump()
+        except ValidationError as e:
+            details = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                for error in e.errors()
+            )
+            self.report.add_error(self.line_number, details)
+        except ValueError as e:
+            self.report.add_error(self.line_number, str(e))
+        return None
+
+
+def iter_rows(kind: str, lines: Iterable[str], fmt: str, report: ImportReport) -> Iterator[Dict]:
+    """Validated rows from an iterable of lines (e.g. an open file)"""
+    parser = RowParser(kind, fmt, report)
+    for line in lines:
+        row = parser.parse(line)
+        if row is not None:
+            yield row
+
+
+async def aiter_upload_rows(kind: str, upload, fmt: str, report: ImportReport) -> AsyncIterator[Dict]:
+    """Validated rows from an UploadFile, read UPLOAD_READ_BYTES at a time"""
+    parser = RowParser(kind, fmt, report)
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    while True:
+        block = await upload.read(UPLOAD_READ_BYTES)
+        pending += decoder.decode(block, final=not block)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            row = parser.parse(line)
+            if row is not None:
+                yield row
+        if not block:
+            break
+    row = parser.parse(pending)
+    if row is not None:
+        yield row
+
+
+def chunked(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Bumped by clear(); lets readers skip storing results fetched before a write
+        self.generation = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            generation: Optional[int] = None):
+        """Store a value; ``ttl`` may shorten (never extend) the default TTL.
+
+        If ``generation`` is given and the cache has been cleared since it was
+        read, the value is stale and is dropped.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Authenticated users keyed by JWT subject (email)
+user_cache = TTLCache(
+    maxsize=int(os.getenv("AUTH_USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60")),
+)
+
+# Serialized room catalog responses: "all" and ("room", id) -> (etag, body)
+room_cache = TTLCache(
+    maxsize=int(os.getenv("ROOM_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("ROOM_CACHE_TTL_SECONDS", "30")),
+)
@@ -1,488 +1,1431 @@
-from neo4j import GraphDatabase
-from typing import Optional, List, Dict
+from neo4j import AsyncGraphDatabase, READ_ACCESS, WRITE_ACCESS
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, ConstraintError
+from neo4j.time import Date, DateTime, Time
+from typing import Optional, List, Dict, Tuple, Union, Iterator, AsyncIterator
+from dataclasses import dataclass
 import uuid
-from datetime import datetime
+import json
+import base64
+from datetime import datetime, date, timedelta, timezone
+import os
 import time
+import random
+import asyncio
+import inspect
 import logging
+import threading
+from cache import user_cache, room_cache
+from models import RoomUpdate, BookingUpdate, NotificationUpdate
+from events import publish_event
+from repository import Repository
+from timing import phase
+from metrics import observe_db_method, DB_RETRIES, DB_ACQUIRE_SECONDS
 
 logger = logging.getLogger(__name__)
 
-class Neo4jConnection:
-    def __init__(self, uri: str, user: str, password: str):
+# Number of live Neo4j drivers in this process (each owns a connection pool)
+_driver_count = 0
+_driver_count_lock = threading.Lock()
+
+def _track_driver(delta: int):
+    global _driver_count
+    with _driver_count_lock:
+        _driver_count += delta
+
+def get_driver_count() -> int:
+    """Return how many Neo4j drivers are currently open in this process"""
+    return _driver_count
+
+
+# ---- Record conversion ----
+
+def _temporal_to_native(value):
+    return value.to_native()
+
+def _list_to_native(values):
+    return [_to_native(value) for value in values]
+
+def _dict_to_native(values):
+    return {key: _to_native(value) for key, value in values.items()}
+
+# Exact-type dispatch: one dict lookup per property instead of str(type) tests
+_NATIVE_CONVERTERS = {
+    DateTime: _temporal_to_native,
+    Date: _temporal_to_native,
+    Time: _temporal_to_native,
+    list: _list_to_native,
+    dict: _dict_to_native,
+}
+
+def _to_native(value):
+    converter = _NATIVE_CONVERTERS.get(type(value))
+    return converter(value) if converter else value
+
+def _node_to_dict(node) -> Dict:
+    """Copy a node's (flat) properties into a dict of JSON-friendly Python values"""
+    get_converter = _NATIVE_CONVERTERS.get
+    row = {}
+    for key, value in node.items():
+        converter = get_converter(type(value))
+        row[key] = converter(value) if converter else value
+    return row
+
+
+# ---- Typed list rows ----
+# Slotted rows for the list endpoints. Neo4j never stores nulls, so a None
+# field means the property is absent and is dropped when serializing.
+
+@dataclass(slots=True)
+class RoomRow:
+    id: str
+    room_number: Optional[str] = None
+    room_type: Optional[str] = None
+    capacity: Optional[int] = None
+    price: Optional[float] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_node(cls, node) -> "RoomRow":
+        price = node.get("price")
+        return cls(node["id"], node.get("room_number"), node.get("room_type"),
+                   node.get("capacity"), None if price is None else float(price),
+                   node.get("status"), _to_native(node.get("created_at")))
+
+
+@dataclass(slots=True)
+class UserSummaryRow:
+    """Public part of a User node (never includes the password hash)"""
+    id: str
+    email: Optional[str] = None
+    username: Optional[str] = None
+    role: Optional[str] = None
+
+    @classmethod
+    def from_node(cls, node) -> "UserSummaryRow":
+        return cls(node["id"], node.get("email"), node.get("username"), node.get("role"))
+
+
+@dataclass(slots=True)
+class BookingRow:
+    id: str
+    # date for new bookings; legacy rows may still hold free-form strings
+    start_date: Optional[Union[date, str]] = None
+    end_date: Optional[Union[date, str]] = None
+    duration: Optional[int] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    room: Optional[RoomRow] = None
+
+    @classmethod
+    def from_node(cls, node, room: Optional[RoomRow] = None) -> "BookingRow":
+        return cls(node["id"], _to_native(node.get("start_date")), _to_native(node.get("end_date")),
+                   node.get("duration"), node.get("status"), _to_native(node.get("created_at")),
+                   _to_native(node.get("updated_at")), room)
+
+
+@dataclass(slots=True)
+class TenantRow:
+    id: str
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    created_at: Optional[datetime] = None
+    room: Optional[RoomRow] = None
+
+    @classmethod
+    def from_node(cls, node, room: Optional[RoomRow] = None) -> "TenantRow":
+        return cls(node["id"], node.get("name"), node.get("email"), node.get("phone"),
+                   _to_native(node.get("created_at")), room)
+
+
+@dataclass(slots=True)
+class NotificationRow:
+    id: str
+    message: Optional[str] = None
+    type: Optional[str] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    booking_id: Optional[str] = None
+    user: Optional[UserSummaryRow] = None
+
+    @classmethod
+    def from_node(cls, node, booking_id: Optional[str] = None,
+                  user: Optional[UserSummaryRow] = None) -> "NotificationRow":
+        return cls(node["id"], node.get("message"), node.get("type"), node.get("status"),
+                   _to_native(node.get("created_at")), _to_native(node.get("updated_at")),
+                   booking_id, user)
+
+
+# ---- Retry policy ----
+
+# execute_read/execute_write already retry TransientError (deadlocks, leader switches)
+# for up to max_transaction_retry_time. Retrying those again here would multiply the
+# attempts, so the outer loop only covers losing the connection or routing table.
+RETRYABLE_ERRORS = (ServiceUnavailable, SessionExpired)
+
+def _is_retryable(error: Exception) -> bool:
+    return isinstance(error, RETRYABLE_ERRORS)
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def _timed_work_async(work, access_mode: str):
+    """Wrap work(tx) so the wait before its first run is recorded as connection acquisition"""
+    started = time.perf_counter()
+    pending = [True]
+
+    async def timed(tx):
+        if pending:
+            pending.clear()
+            DB_ACQUIRE_SECONDS.observe(time.perf_counter() - started, access_mode)
+        return await work(tx)
+    return timed
+
+def _pool_stats(driver, max_size: int) -> Optional[Dict[str, int]]:
+    """Open / in-use connections from the driver's pool (private API; None if it changes)"""
+    try:
+        connections = [c for queue in list(driver._pool.connections.values()) for c in list(queue)]
+        reserved = sum(driver._pool.connections_reservations.values())
+    except Exception:
+        return None
+    return {
+        "max_size": max_size,
+        "open": len(connections),
+        "in_use": sum(1 for c in connections if c.in_use),
+        "opening": reserved,
+    }
+
+# ---- Keyset pagination helpers ----
+
+# updated_at is stamped when a write's statement runs but becomes visible only
+# at commit, so a slow write can land behind a watermark handed out meanwhile.
+# Change-feed watermarks therefore never pass rows younger than this; covers the
+# longest write transaction plus clock skew between the API and the database.
+FEED_SAFETY_LAG_SECONDS = float(os.getenv("FEED_SAFETY_LAG_SECONDS", "10"))
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+class RoomUnavailableError(Exception):
+    """Raised when a room cannot take a new booking"""
+
+
+class Page(list):
+    """A page of rows; ``next_cursor`` is None on the last page.
+
+    Change-feed pages also set ``watermark`` (see _build_page).
+    """
+    next_cursor = None
+    watermark = None
+
+
+def encode_cursor(sort_key, item_id: str) -> str:
+    """Opaque cursor for the row identified by (sort key, id)"""
+    if hasattr(sort_key, "iso_format"):
+        # Keep Neo4j's nanosecond precision so the next page starts exactly here
+        sort_key = sort_key.iso_format()
+    raw = json.dumps([sort_key, item_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    if not cursor:
+        return None, None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, item_id = json.loads(raw)
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return sort_key, item_id
+
+
+def _page_params(limit: Optional[int], cursor: Optional[str]) -> Dict:
+    """Query parameters for a keyset page; one extra row is fetched to detect a next page"""
+    after_key, after_id = decode_cursor(cursor)
+    return {"after_key": after_key, "after_id": after_id,
+            "limit": limit + 1 if limit else None}
+
+
+def _limit_clause(limit: Optional[int]) -> str:
+    return "LIMIT $limit" if limit else ""
+
+
+def _build_page(entries: List[Tuple[Dict, object, str]], limit: Optional[int],
+                since: Optional[str] = None) -> Page:
+    """Build a Page from (row, raw sort key, id) tuples fetched with _page_params.
+
+    For a change feed (``since`` given) the page also carries the watermark to
+    send next time: the last returned row older than FEED_SAFETY_LAG_SECONDS, or
+    ``since`` itself when there is none. Younger rows are returned again by the
+    next poll, so feeds are at-least-once and clients upsert rows by id.
+    """
+    page = Page(row for row, _, _ in (entries[:limit] if limit else entries))
+    if limit and len(entries) > limit:
+        _, sort_key, item_id = entries[limit - 1]
+        page.next_cursor = encode_cursor(sort_key, item_id)
+    if since is not None:
+        page.watermark = since
+        settled = datetime.now(timezone.utc) - timedelta(seconds=FEED_SAFETY_LAG_SECONDS)
+        for _, sort_key, item_id in reversed(entries[:len(page)]):
+            if _feed_time(sort_key) <= settled:
+                page.watermark = encode_cursor(sort_key, item_id)
+                break
+    return page
+
+
+def _feed_time(sort_key) -> datetime:
+    """updated_at as an aware datetime, from a Neo4j DateTime or an ISO string"""
+    if hasattr(sort_key, "to_native"):
+        return sort_key.to_native()
+    return datetime.fromisoformat(sort_key) if isinstance(sort_key, str) else sort_key
+
+
+def _feed_clauses(var: str, since: Optional[str]) -> Tuple[str, str, str]:
+    """(WHERE, ORDER BY, sort property) for a newest-first listing of ``var``,
+    or for its oldest-first change feed by updated_at when ``since`` is given"""
+    if since is None:
+        where = (f"($after_id IS NULL OR {var}.created_at < datetime($after_key) "
+                 f"OR ({var}.created_at = datetime($after_key) AND {var}.id < $after_id))")
+        return where, f"ORDER BY {var}.created_at DESC, {var}.id DESC", "created_at"
+    where = (f"($after_id IS NULL OR {var}.updated_at > datetime($after_key) "
+             f"OR ({var}.updated_at = datetime($after_key) AND {var}.id > $after_id))")
+    return where, f"ORDER BY {var}.updated_at, {var}.id", "updated_at"
+
+# ---- Partial updates ----
+# One fixed statement per entity so the server's plan cache stays hot; the
+# property map is limited to the fields of the matching Pydantic update model.
+# Every update also stamps updated_at, which drives the ?since= change feeds.
+
+UPDATE_ROOM_QUERY = "MATCH (r:Room {id: $id}) SET r += $props, r.updated_at = datetime()"
+UPDATE_BOOKING_QUERY = """
+MATCH (b:Booking {id: $id}) SET b += $props, b.updated_at = datetime()
+WITH b OPTIONAL MATCH (u:User)-[:MADE_BOOKING]->(b)
+RETURN u.id AS user_id, b.status AS status
+"""
+UPDATE_NOTIFICATION_QUERY = """
+MATCH (n:Notification {id: $id}) SET n += $props, n.updated_at = datetime()
+WITH n OPTIONAL MATCH (n)-[:FOR_USER]->(u:User)
+RETURN u.id AS user_id, n.status AS status
+"""
+
+ROOM_UPDATE_FIELDS = frozenset(RoomUpdate.model_fields)
+BOOKING_UPDATE_FIELDS = frozenset(BookingUpdate.model_fields)
+NOTIFICATION_UPDATE_FIELDS = frozenset(NotificationUpdate.model_fields)
+
+BACKFILL_UPDATED_AT_QUERY = """
+MATCH (x) WHERE (x:Booking OR x:Notification) AND x.updated_at IS NULL
+SET x.updated_at = coalesce(x.created_at, datetime())
+RETURN count(x) AS backfilled
+"""
+
+def _update_props(updates: Dict, allowed: frozenset) -> Dict:
+    """Validate update keys against the whitelist; unknown keys are an error"""
+    unknown = set(updates) - allowed
+    if unknown:
+        raise ValueError(f"Unknown update fields: {', '.join(sorted(unknown))}")
+    return dict(updates)
+
+
+# ---- Bulk import ----
+# Rows are written with UNWIND in chunked transactions. Each chunk skips rows
+# whose natural key already exists, so retrying a chunk or re-running an
+# import never duplicates data.
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+BULK_CREATE_ROOMS_QUERY = """
+UNWIND $rows AS row
+WITH row WHERE NOT EXISTS { MATCH (:Room {room_number: row.room_number}) }
+CREATE (r:Room {
+    id: row.id,
+    room_number: row.room_number,
+    room_type: row.room_type,
+    capacity: row.capacity,
+    price: row.price,
+    status: row.status,
+    created_at: datetime()
+})
+RETURN count(r) AS created
+"""
+
+BULK_CREATE_USERS_QUERY = """
+UNWIND $rows AS row
+WITH row WHERE NOT EXISTS { MATCH (:User {email: row.email}) }
+CREATE (u:User {
+    id: row.id,
+    email: row.email,
+    username: row.username,
+    password: row.password,
+    role: row.role,
+    created_at: datetime()
+})
+RETURN count(u) AS created
+"""
+
+EXISTING_USER_EMAILS_QUERY = "MATCH (u:User) WHERE u.email IN $emails RETURN u.email AS email"
+
+# Tenants name their room by id or by room number
+BULK_CREATE_TENANTS_QUERY = """
+UNWIND $rows AS row
+OPTIONAL MATCH (byNumber:Room {room_number: row.room_number})
+WITH row, head(collect(byNumber)) AS byNumber
+OPTIONAL MATCH (byId:Room {id: row.room_id})
+WITH row, coalesce(byId, byNumber) AS r
+WHERE r IS NOT NULL AND NOT EXISTS { MATCH (:Tenant {email: row.email}) }
+CREATE (t:Tenant {
+    id: row.id,
+    name: row.name,
+    email: row.email,
+    phone: row.phone,
+    created_at: datetime()
+})
+CREATE (t)-[:OCCUPIES]->(r)
+RETURN count(t) AS created
+"""
+
+def _chunks(rows: List[Dict], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def _dedupe(rows: List[Dict], key: str) -> List[Dict]:
+    """Keep the first row per natural key; a chunk cannot see its own writes"""
+    seen = set()
+    unique = []
+    for row in rows:
+        if row[key] not in seen:
+            seen.add(row[key])
+            unique.append(row)
+    return unique
+
+def _room_import_rows(rows: List[Dict]) -> List[Dict]:
+    return [{"status": "available", **row, "id": str(uuid.uuid4())}
+            for row in _dedupe(rows, "room_number")]
+
+def _tenant_import_rows(rows: List[Dict]) -> List[Dict]:
+    return [{"room_id": None, "room_number": None, **row, "id": str(uuid.uuid4())}
+            for row in _dedupe(rows, "email")]
+
+def _bulk_result(submitted: int, created: int, seconds: float) -> Dict:
+    return {
+        "submitted": submitted,
+        "created": created,
+        "skipped": submitted - created,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(submitted / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+# ---- Streaming export ----
+# Flat rows for the admin export endpoints, read straight off the result
+# cursor. Each query filters on its indexed sort property so the planner can
+# return rows in index order instead of sorting everything before the first row.
+
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "1000"))
+
+EXPORTS = {
+    "bookings": (
+        ["id", "status", "start_date", "end_date", "duration", "created_at",
+         "user_id", "user_email", "room_id", "room_number"],
+        """
+        MATCH (b:Booking) WHERE b.created_at IS NOT NULL
+        OPTIONAL MATCH (u:User)-[:MADE_BOOKING]->(b)
+        OPTIONAL MATCH (b)-[:FOR_ROOM]->(r:Room)
+        RETURN b.id, b.status, b.start_date, b.end_date, b.duration, b.created_at,
+               u.id, u.email, r.id, r.room_number
+        ORDER BY b.created_at
+        """,
+    ),
+    "tenants": (
+        ["id", "name", "email", "phone", "created_at", "room_id", "room_number"],
+        """
+        MATCH (t:Tenant)
+        OPTIONAL MATCH (t)-[:OCCUPIES]->(r:Room)
+        RETURN t.id, t.name, t.email, t.phone, t.created_at, r.id, r.room_number
+        ORDER BY t.name
+        """,
+    ),
+    "notifications": (
+        ["id", "type", "status", "message", "created_at", "user_id", "user_email", "booking_id"],
+        """
+        MATCH (n:Notification) WHERE n.created_at IS NOT NULL
+        OPTIONAL MATCH (n)-[:FOR_USER]->(u:User)
+        OPTIONAL MATCH (n)-[:ABOUT_BOOKING]->(b:Booking)
+        RETURN n.id, n.type, n.status, n.message, n.created_at, u.id, u.email, b.id
+        ORDER BY n.created_at
+        """,
+    ),
+}
+
+def _export_row(columns: List[str], record) -> Dict:
+    return dict(zip(columns, map(_to_native, record.values())))
+
+
+# ---- Schema manifest ----
+# Applied with IF NOT EXISTS on every startup, so re-running is a no-op.
+
+# (label, property) uniqueness constraints; each also provides an index
+SCHEMA_CONSTRAINTS = [
+    ("User", "id"),
+    ("User", "email"),
+    ("Room", "id"),
+    ("Booking", "id"),
+    ("Tenant", "id"),
+    ("Notification", "id"),
+]
+
+# (index name, label, property) range indexes behind ORDER BY and status filters
+SCHEMA_INDEXES = [
+    ("room_room_number", "Room", "room_number"),
+    ("room_status", "Room", "status"),
+    ("booking_status", "Booking", "status"),
+    ("booking_created_at", "Booking", "created_at"),
+    ("booking_updated_at", "Booking", "updated_at"),
+    ("booking_start_date", "Booking", "start_date"),
+    ("booking_end_date", "Booking", "end_date"),
+    ("tenant_name", "Tenant", "name"),
+    ("tenant_email", "Tenant", "email"),
+    ("notification_status", "Notification", "status"),
+    ("notification_created_at", "Notification", "created_at"),
+    ("notification_updated_at", "Notification", "updated_at"),
+]
+
+SHOW_INDEXES_QUERY = "SHOW INDEXES YIELD name, labelsOrTypes, properties, state"
+
+def _schema_statements() -> List[str]:
+    statements = [
+        f"CREATE CONSTRAINT IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+        for label, prop in SCHEMA_CONSTRAINTS
+    ]
+    statements += [
+        f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"
+        for name, label, prop in SCHEMA_INDEXES
+    ]
+    return statements
+
+def _index_report(indexes: List[Dict]) -> Dict[str, List[str]]:
+    """Check SHOW INDEXES rows against the manifest, matching on label and property"""
+    states = {}
+    for index in indexes:
+        for label in index.get("labelsOrTypes") or []:
+            if len(index.get("properties") or []) == 1:
+                states[(label, index["properties"][0])] = index["state"]
+    expected = [(label, prop) for label, prop in SCHEMA_CONSTRAINTS]
+    expected += [(label, prop) for _, label, prop in SCHEMA_INDEXES]
+    report = {"online": [], "populating": [], "missing": []}
+    for label, prop in expected:
+        state = states.get((label, prop))
+        key = "missing" if state is None else "online" if state == "ONLINE" else "populating"
+        report[key].append(f"{label}.{prop}")
+    return report
+
+
+class AsyncNeo4jConnection(Repository):
+    """Neo4j Repository built on AsyncGraphDatabase.
+
+    Every query method is a coroutine so FastAPI handlers can await Aura
+    round-trips without blocking the event loop. This is the Repository the API
+    runs on by default; scripts use it through the blocking Neo4jConnection.
+    """
+
+    def __init__(self, uri: str, user: str, password: str, database: Optional[str] = None):
         self.uri = uri
         self.user = user
         self.password = password
+        # Naming the database up front skips the home-database lookup per session
+        self.database = database or os.getenv("NEO4J_DATABASE") or None
         self.driver = None
+        # Shared by every session so reads routed to followers see this process's writes
+        self.bookmark_manager = None
         self.max_connection_lifetime = 3600  # 1 hour
-        self.connection_timeout = 60  # Increased from 30 to 60 seconds
-        self.max_retry_attempts = 5  # Increased from 3 to 5
-        self.retry_delay = 2  # Increased from 1 to 2 seconds
+        self.connection_timeout = 60
+        self.max_connection_pool_size = 10
+        self.max_retry_attempts = 5
+        self.retry_delay = 0.25  # Base backoff, doubled per attempt
+        self.retry_max_delay = 4
+        self.retry_deadline = 15  # Total seconds spent retrying one operation
+
+    def _convert_neo4j_types(self, data):
+        """Convert Neo4j types to standard Python types for JSON serialization"""
+        with phase("convert"):
+            return _to_native(data)
+
+    @property
+    def connected(self) -> bool:
+        return self.driver is not None
+
+    async def verify_connectivity(self):
+        await self.driver.verify_connectivity()
 
     def connect(self):
-        """Connect to Neo4j with proper configuration for Aura"""
+        """Create the async Neo4j driver (no network I/O until first use)"""
         try:
-            # Configure driver for Neo4j Aura with connection pooling
-            self.driver = GraphDatabase.driver(
+            self.bookmark_manager = AsyncGraphDatabase.bookmark_manager()
+            self.driver = AsyncGraphDatabase.driver(
                 self.uri,
                 auth=(self.user, self.password),
                 max_connection_lifetime=self.max_connection_lifetime,
-                max_connection_pool_size=10,
+                max_connection_pool_size=self.max_connection_pool_size,
                 connection_timeout=self.connection_timeout,
-                connection_acquisition_timeout=120,  # Increased from 60 to 120 seconds
-                # Note: trusted_certificates not needed with neo4j+s:// scheme
+                connection_acquisition_timeout=120,
+                max_transaction_retry_time=self.retry_deadline,
             )
-            logger.info("Neo4j driver configured for Aura")
-
-            # Don't test connection immediately - let it be lazy
-            # Connection will be tested when first used
+            _track_driver(1)
+            logger.info("Async Neo4j driver configured for Aura")
 
         except Exception as e:
-            logger.error(f"Failed to create Neo4j driver: {e}")
+            logger.error(f"Failed to create async Neo4j driver: {e}")
             self.driver = None
             raise
 
-    def close(self):
-        """Close the Neo4j driver"""
+    async def close(self):
+        """Close the async Neo4j driver"""
         if self.driver:
-            self.driver.close()
+            await self.driver.close()
+            self.driver = None
+            self.bookmark_manager = None
+            _track_driver(-1)
 
-    def _execute_with_retry(self, operation, *args, **kwargs):
-        """Execute database operation with retry logic"""
-        for attempt in range(self.max_retry_attempts):
-            try:
-                return operation(*args, **kwargs)
-            except Exception as e:
-                logger.warning(f"Database operation failed (attempt {attempt + 1}/{self.max_retry_attempts}): {e}")
+    def pool_stats(self) -> Optional[Dict[str, int]]:
+        return _pool_stats(self.driver, self.max_connection_pool_size) if self.driver else None
 
-                if attempt < self.max_retry_attempts - 1:
-                    time.sleep(self.retry_delay)
-                else:
-                    logger.error(f"Database operation failed after {self.max_retry_attempts} attempts")
+    def _session(self, access_mode, **config):
+        """Session on the configured database, chained to the shared bookmark manager"""
+        return self.driver.session(database=self.database, default_access_mode=access_mode,
+                                   bookmark_manager=self.bookmark_manager, **config)
 
-        # This should never be reached, but just in case
-        raise Exception("Database operation failed after all retry attempts")
+    async def _read(self, work):
+        """Run work(tx) in a managed read transaction (routable to read replicas)"""
+        async with self._session(READ_ACCESS) as session:
+            return await session.execute_read(_timed_work_async(work, "read"))
 
-    def _convert_neo4j_types(self, data):
-        """Convert Neo4j types to standard Python types for JSON serialization"""
-        if isinstance(data, dict):
-            return {key: self._convert_neo4j_types(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self._convert_neo4j_types(item) for item in data]
-        elif hasattr(data, '__class__') and 'neo4j.time' in str(data.__class__):
-            # Convert Neo4j datetime objects to Python datetime
-            return data.to_native()
-        else:
-            return data
+    async def _write(self, work):
+        """Run work(tx) in a managed write transaction on the leader"""
+        async with self._session(WRITE_ACCESS) as session:
+            return await session.execute_write(_timed_work_async(work, "write"))
+
+    async def ping(self) -> bool:
+        """Run a trivial read query to check the database answers"""
+        async def _ping_tx(tx):
+            result = await tx.run("RETURN 'Database operational' as status")
+            return (await result.single())["status"]
 
-    def create_constraints(self):
+        return await self._read(_ping_tx) == 'Database operational'
+
+    async def _execute_with_retry(self, method: str, operation, *args, **kwargs):
+        """Await database operation, retrying connection failures with backoff"""
+        deadline = time.monotonic() + self.retry_deadline
+        with phase("db", method), observe_db_method(method):
+            for attempt in range(self.max_retry_attempts):
+                try:
+                    return await operation(*args, **kwargs)
+                except Exception as e:
+                    if not _is_retryable(e):
+                        raise
+
+                    delay = _backoff_delay(attempt, self.retry_delay, self.retry_max_delay)
+                    if attempt == self.max_retry_attempts - 1 or time.monotonic() + delay > deadline:
+                        logger.error(f"Database operation failed after {attempt + 1} attempts: {e}")
+                        raise
+
+                    logger.warning(f"Database connection error (attempt {attempt + 1}/{self.max_retry_attempts}), "
+                                   f"retrying in {delay:.2f}s: {e}")
+                    DB_RETRIES.inc(method)
+                    await asyncio.sleep(delay)
+
+    async def create_constraints(self):
         """Create database constraints with error handling and retry logic"""
-        def _create_constraints_internal():
-            with self.driver.session() as session:
-                # Create unique constraints
-                session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (u:User) REQUIRE u.id IS UNIQUE")
-                session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE")
-                session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (r:Room) REQUIRE r.id IS UNIQUE")
-                session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (b:Booking) REQUIRE b.id IS UNIQUE")
-                session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (t:Tenant) REQUIRE t.id IS UNIQUE")
-                session.run("CREATE CONSTRAINT IF NOT EXISTS FOR (n:Notification) REQUIRE n.id IS UNIQUE")
+        async def _create_constraints_internal(tx):
+            for statement in _schema_statements():
+                await tx.run(statement)
 
         try:
-            self._execute_with_retry(_create_constraints_internal)
+            await self._execute_with_retry("create_constraints", self._write, _create_constraints_internal)
         except Exception as e:
             logger.warning(f"Could not create database constraints: {e}")
-            # Don't raise the exception - allow app to continue
-
-    def create_user(self, email: str, username: str, password: str, role: str = "user") -> str:
-        def _create_user_internal():
-            with self.driver.session() as session:
-                user_id = str(uuid.uuid4())
-                # Hash the password before storing
-                from auth import get_password_hash
-                hashed_password = get_password_hash(password)
-
-                query = """
-                CREATE (u:User {
-                    id: $id,
-                    email: $email,
-                    username: $username,
-                    password: $password,
-                    role: $role,
-                    created_at: datetime()
-                })
-                RETURN u.id as id
-                """
-                result = session.run(query, id=user_id, email=email, username=username,
-                                   password=hashed_password, role=role)
-                return result.single()["id"]
+
+    async def index_report(self) -> Optional[Dict[str, List[str]]]:
+        """Manifest properties grouped by index state, as reported by SHOW INDEXES"""
+        async def _index_report_internal(tx):
+            result = await tx.run(SHOW_INDEXES_QUERY)
+            return [record.data() async for record in result]
+
+        try:
+            return _index_report(await self._execute_with_retry("index_report", self._read, _index_report_internal))
+        except Exception as e:
+            logger.warning(f"Could not list database indexes: {e}")
+            return None
+
+    async def create_user(self, email: str, username: str, password: str, role: str = "user") -> str:
+        # Hash outside the retry loop in the bounded password pool
+        from auth import get_password_hash_async
+        hashed_password = await get_password_hash_async(password)
+
+        async def _create_user_internal(tx):
+            user_id = str(uuid.uuid4())
+            query = """
+            CREATE (u:User {
+                id: $id,
+                email: $email,
+                username: $username,
+                password: $password,
+                role: $role,
+                created_at: datetime()
+            })
+            RETURN u.id as id
+            """
+            result = await tx.run(query, id=user_id, email=email, username=username,
+                                  password=hashed_password, role=role)
+            return (await result.single())["id"]
 
         try:
-            return self._execute_with_retry(_create_user_internal)
+            user_id = await self._execute_with_retry("create_user", self._write, _create_user_internal)
+            user_cache.invalidate(email)
+            return user_id
         except Exception as e:
             logger.error(f"Database error in create_user: {e}")
-            # Check if it's a constraint violation (duplicate email)
-            if "ConstraintValidationFailed" in str(e) or "already exists" in str(e):
+            if isinstance(e, ConstraintError) or "already exists" in str(e):
                 raise Exception("User with this email already exists")
             raise Exception("Database connection unavailable. Please try again later.")
 
-    def get_user_by_email(self, email: str) -> Optional[Dict]:
-        def _get_user_internal():
-            with self.driver.session() as session:
-                query = "MATCH (u:User {email: $email}) RETURN u"
-                result = session.run(query, email=email)
-                record = result.single()
-                if record:
-                    return self._convert_neo4j_types(dict(record["u"]))
-                return None
+    async def get_user_by_email(self, email: str) -> Optional[Dict]:
+        async def _get_user_internal(tx):
+            query = "MATCH (u:User {email: $email}) RETURN u"
+            result = await tx.run(query, email=email)
+            record = await result.single()
+            if record:
+                with phase("convert"):
+                    return _node_to_dict(record["u"])
+            return None
 
         try:
-            return self._execute_with_retry(_get_user_internal)
+            return await self._execute_with_retry("get_user_by_email", self._read, _get_user_internal)
         except Exception as e:
             logger.error(f"Database error in get_user_by_email: {e}")
             return None
 
-    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
-        def _get_user_by_id_internal():
-            with self.driver.session() as session:
-                query = "MATCH (u:User {id: $id}) RETURN u"
-                result = session.run(query, id=user_id)
-                record = result.single()
-                if record:
-                    return self._convert_neo4j_types(dict(record["u"]))
-                return None
+    async def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        async def _get_user_by_id_internal(tx):
+            query = "MATCH (u:User {id: $id}) RETURN u"
+            result = await tx.run(query, id=user_id)
+            record = await result.single()
+            if record:
+                with phase("convert"):
+                    return _node_to_dict(record["u"])
+            return None
 
         try:
-            return self._execute_with_retry(_get_user_by_id_internal)
+            return await self._execute_with_retry("get_user_by_id", self._read, _get_user_by_id_internal)
         except Exception as e:
             logger.error(f"Database error in get_user_by_id: {e}")
             return None
 
-    def create_room(self, room_number: str, room_type: str, capacity: int,
-                   price: float, status: str = "available") -> str:
-        def _create_room_internal():
-            with self.driver.session() as session:
-                room_id = str(uuid.uuid4())
-                query = """
-                CREATE (r:Room {
-                    id: $id,
-                    room_number: $room_number,
-                    room_type: $room_type,
-                    capacity: $capacity,
-                    price: $price,
-                    status: $status,
-                    created_at: datetime()
-                })
-                RETURN r.id as id
-                """
-                result = session.run(query, id=room_id, room_number=room_number,
-                                   room_type=room_type, capacity=capacity,
-                                   price=price, status=status)
-                return result.single()["id"]
+    async def create_room(self, room_number: str, room_type: str, capacity: int,
+                          price: float, status: str = "available") -> str:
+        async def _create_room_internal(tx):
+            room_id = str(uuid.uuid4())
+            query = """
+            CREATE (r:Room {
+                id: $id,
+                room_number: $room_number,
+                room_type: $room_type,
+                capacity: $capacity,
+                price: $price,
+                status: $status,
+                created_at: datetime()
+            })
+            RETURN r.id as id
+            """
+            result = await tx.run(query, id=room_id, room_number=room_number,
+                                  room_type=room_type, capacity=capacity,
+                                  price=price, status=status)
+            return (await result.single())["id"]
 
         try:
-            return self._execute_with_retry(_create_room_internal)
+            room_id = await self._execute_with_retry("create_room", self._write, _create_room_internal)
+            room_cache.clear()
+            return room_id
         except Exception as e:
             logger.error(f"Database error in create_room: {e}")
             raise Exception("Database connection unavailable. Please try again later.")
 
-    def get_all_rooms(self) -> List[Dict]:
-        def _get_all_rooms_internal():
-            with self.driver.session() as session:
-                query = "MATCH (r:Room) RETURN r ORDER BY r.room_number"
-                result = session.run(query)
-                return [self._convert_neo4j_types(dict(record["r"])) for record in result]
+    async def get_all_rooms(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> List[RoomRow]:
+        params = _page_params(limit, cursor)
+
+        async def _get_all_rooms_internal(tx):
+            query = """
+            MATCH (r:Room)
+            WHERE $after_id IS NULL OR r.room_number > $after_key
+               OR (r.room_number = $after_key AND r.id > $after_id)
+            RETURN r
+            ORDER BY r.room_number, r.id
+            """ + _limit_clause(limit)
+            result = await tx.run(query, **params)
+            records = [record async for record in result]
+            with phase("convert"):
+                return _build_page([
+                    (RoomRow.from_node(record["r"]), record["r"]["room_number"], record["r"]["id"])
+                    for record in records
+                ], limit)
 
         try:
-            return self._execute_with_retry(_get_all_rooms_internal)
+            return await self._execute_with_retry("get_all_rooms", self._read, _get_all_rooms_internal)
         except Exception as e:
             logger.error(f"Database error in get_all_rooms: {e}")
-            return []
+            return Page()
 
-    def get_room_by_id(self, room_id: str) -> Optional[Dict]:
-        def _get_room_internal():
-            with self.driver.session() as session:
-                query = "MATCH (r:Room {id: $id}) RETURN r"
-                result = session.run(query, id=room_id)
-                record = result.single()
-                if record:
-                    return self._convert_neo4j_types(dict(record["r"]))
-                return None
+    async def get_room_by_id(self, room_id: str) -> Optional[Dict]:
+        async def _get_room_internal(tx):
+            query = "MATCH (r:Room {id: $id}) RETURN r"
+            result = await tx.run(query, id=room_id)
+            record = await result.single()
+            if record:
+                with phase("convert"):
+                    return _node_to_dict(record["r"])
+            return None
 
         try:
-            return self._execute_with_retry(_get_room_internal)
+            return await self._execute_with_retry("get_room_by_id", self._read, _get_room_internal)
         except Exception as e:
             logger.error(f"Database error in get_room_by_id: {e}")
             return None
 
-    def update_room(self, room_id: str, updates: Dict):
-        def _update_room_internal():
-            with self.driver.session() as session:
-                set_clause = ", ".join([f"r.{key} = ${key}" for key in updates.keys()])
-                query = f"MATCH (r:Room {{id: $id}}) SET {set_clause} RETURN r"
-                session.run(query, id=room_id, **updates)
+    async def find_available_rooms(self, start: date, end: date, room_type: Optional[str] = None,
+                                   capacity: Optional[int] = None) -> List[RoomRow]:
+        """Rooms with no pending/approved booking overlapping [start, end)"""
+        async def _find_available_rooms_internal(tx):
+            # Busy rooms come from a range seek on Booking.start_date
+            query = """
+            CALL {
+                MATCH (b:Booking)-[:FOR_ROOM]->(busy:Room)
+                WHERE b.start_date < $end AND b.end_date > $start
+                  AND b.status IN ['pending', 'approved']
+                RETURN collect(DISTINCT busy.id) AS busy_ids
+            }
+            MATCH (r:Room)
+            WHERE r.status <> 'maintenance'
+              AND ($room_type IS NULL OR r.room_type = $room_type)
+              AND ($capacity IS NULL OR r.capacity >= $capacity)
+              AND NOT r.id IN busy_ids
+            RETURN r
+            ORDER BY r.room_number, r.id
+            """
+            result = await tx.run(query, start=start, end=end,
+                                  room_type=room_type, capacity=capacity)
+            records = [record async for record in result]
+            with phase("convert"):
+                return [RoomRow.from_node(record["r"]) for record in records]
 
         try:
-            self._execute_with_retry(_update_room_internal)
+            return await self._execute_with_retry("find_available_rooms", self._read, _find_available_rooms_internal)
+        except Exception as e:
+            logger.error(f"Database error in find_available_rooms: {e}")
+            return []
+
+    async def migrate_booking_dates(self) -> int:
+        """Convert legacy ISO string booking dates to native Cypher dates"""
+        async def _migrate_booking_dates_internal(tx):
+            query = """
+            MATCH (b:Booking)
+            WHERE (b.start_date IS :: STRING AND b.start_date =~ '[0-9]{4}-[0-9]{2}-[0-9]{2}.*')
+               OR (b.end_date IS :: STRING AND b.end_date =~ '[0-9]{4}-[0-9]{2}-[0-9]{2}.*')
+            SET b.start_date = CASE WHEN b.start_date IS :: STRING
+                                    THEN date(left(b.start_date, 10)) ELSE b.start_date END,
+                b.end_date = CASE WHEN b.end_date IS :: STRING
+                                  THEN date(left(b.end_date, 10)) ELSE b.end_date END
+            RETURN count(b) AS migrated
+            """
+            result = await tx.run(query)
+            return (await result.single())["migrated"]
+
+        try:
+            return await self._execute_with_retry("migrate_booking_dates", self._write, _migrate_booking_dates_internal)
+        except Exception as e:
+            logger.warning(f"Could not migrate booking dates: {e}")
+            return 0
+
+    async def backfill_updated_at(self) -> int:
+        """Stamp updated_at = created_at on bookings and notifications written before it existed"""
+        async def _backfill_updated_at_internal(tx):
+            result = await tx.run(BACKFILL_UPDATED_AT_QUERY)
+            return (await result.single())["backfilled"]
+
+        try:
+            return await self._execute_with_retry("backfill_updated_at", self._write, _backfill_updated_at_internal)
+        except Exception as e:
+            logger.warning(f"Could not backfill updated_at: {e}")
+            return 0
+
+    async def update_room(self, room_id: str, updates: Dict):
+        props = _update_props(updates, ROOM_UPDATE_FIELDS)
+        if not props:
+            return
+
+        async def _update_room_internal(tx):
+            await tx.run(UPDATE_ROOM_QUERY, id=room_id, props=props)
+
+        try:
+            await self._execute_with_retry("update_room", self._write, _update_room_internal)
+            room_cache.clear()
         except Exception as e:
             logger.error(f"Database error in update_room: {e}")
             raise
 
-    def delete_room(self, room_id: str):
-        def _delete_room_internal():
-            with self.driver.session() as session:
-                query = "MATCH (r:Room {id: $id}) DETACH DELETE r"
-                session.run(query, id=room_id)
+    async def delete_room(self, room_id: str):
+        async def _delete_room_internal(tx):
+            query = "MATCH (r:Room {id: $id}) DETACH DELETE r"
+            await tx.run(query, id=room_id)
 
         try:
-            self._execute_with_retry(_delete_room_internal)
+            await self._execute_with_retry("delete_room", self._write, _delete_room_internal)
+            room_cache.clear()
         except Exception as e:
             logger.error(f"Database error in delete_room: {e}")
             raise
 
-    def create_booking(self, user_id: str, room_id: str, start_date: str,
-                      end_date: str, duration: int) -> str:
-        def _create_booking_internal():
-            with self.driver.session() as session:
-                booking_id = str(uuid.uuid4())
-                query = """
-                MATCH (u:User {id: $user_id}), (r:Room {id: $room_id})
-                CREATE (b:Booking {
-                    id: $id,
-                    start_date: $start_date,
-                    end_date: $end_date,
-                    duration: $duration,
-                    status: $status,
-                    created_at: datetime()
-                })
-                CREATE (u)-[:MADE_BOOKING]->(b)
-                CREATE (b)-[:FOR_ROOM]->(r)
-                RETURN b.id as id
-                """
-                result = session.run(query, id=booking_id, user_id=user_id,
-                                   room_id=room_id, start_date=start_date,
-                                   end_date=end_date, duration=duration, status="pending")
-                return result.single()["id"]
+    async def create_booking(self, user_id: str, room_id: str, start_date: str,
+                             end_date: str, duration: int) -> str:
+        async def _create_booking_internal(tx):
+            booking_id = str(uuid.uuid4())
+            query = """
+            MATCH (u:User {id: $user_id}), (r:Room {id: $room_id})
+            CREATE (b:Booking {
+                id: $id,
+                start_date: date($start_date),
+                end_date: date($end_date),
+                duration: $duration,
+                status: $status,
+                created_at: datetime(),
+                updated_at: datetime()
+            })
+            CREATE (u)-[:MADE_BOOKING]->(b)
+            CREATE (b)-[:FOR_ROOM]->(r)
+            RETURN b.id as id
+            """
+            result = await tx.run(query, id=booking_id, user_id=user_id,
+                                  room_id=room_id, start_date=start_date,
+                                  end_date=end_date, duration=duration, status="pending")
+            return (await result.single())["id"]
 
         try:
-            return self._execute_with_retry(_create_booking_internal)
+            return await self._execute_with_retry("create_booking", self._write, _create_booking_internal)
         except Exception as e:
             logger.error(f"Database error in create_booking: {e}")
             raise Exception("Database connection unavailable. Please try again later.")
 
-    def get_user_bookings(self, user_id: str) -> List[Dict]:
-        def _get_user_bookings_internal():
-            with self.driver.session() as session:
-                query = """
-                MATCH (u:User {id: $user_id})-[:MADE_BOOKING]->(b:Booking)-[:FOR_ROOM]->(r:Room)
-                RETURN b, r
-                ORDER BY b.created_at DESC
-                """
-                result = session.run(query, user_id=user_id)
-                bookings = []
-                for record in result:
-                    booking = self._convert_neo4j_types(dict(record["b"]))
-                    booking["room"] = self._convert_neo4j_types(dict(record["r"]))
-                    bookings.append(booking)
-                return bookings
+    async def get_user_bookings(self, user_id: str, limit: Optional[int] = None,
+                                cursor: Optional[str] = None,
+                                since: Optional[str] = None) -> List[BookingRow]:
+        # A change feed (since given) resumes from its watermark instead of a page cursor
+        params = _page_params(limit, cursor if since is None else since)
+        where, order_by, sort_key = _feed_clauses("b", since)
+
+        async def _get_user_bookings_internal(tx):
+            query = """
+            MATCH (u:User {id: $user_id})-[:MADE_BOOKING]->(b:Booking)-[:FOR_ROOM]->(r:Room)
+            WHERE """ + where + """
+            RETURN b, r
+            """ + order_by + " " + _limit_clause(limit)
+            result = await tx.run(query, user_id=user_id, **params)
+            records = [record async for record in result]
+            with phase("convert"):
+                entries = []
+                for record in records:
+                    booking = BookingRow.from_node(record["b"], room=RoomRow.from_node(record["r"]))
+                    entries.append((booking, record["b"][sort_key], record["b"]["id"]))
+                return _build_page(entries, limit, since)
 
         try:
-            return self._execute_with_retry(_get_user_bookings_internal)
+            return await self._execute_with_retry("get_user_bookings", self._read, _get_user_bookings_internal)
         except Exception as e:
             logger.error(f"Database error in get_user_bookings: {e}")
-            return []
+            return Page()
 
-    def get_booking_by_id(self, booking_id: str) -> Optional[Dict]:
-        def _get_booking_internal():
-            with self.driver.session() as session:
-                query = """
-                MATCH (u:User)-[:MADE_BOOKING]->(b:Booking {id: $id})-[:FOR_ROOM]->(r:Room)
-                RETURN b, r, u.id as user_id
-                """
-                result = session.run(query, id=booking_id)
-                record = result.single()
-                if record:
-                    booking = self._convert_neo4j_types(dict(record["b"]))
-                    booking["room"] = self._convert_neo4j_types(dict(record["r"]))
-                    booking["user_id"] = record["user_id"]
-                    return booking
-                return None
+    async def get_booking_by_id(self, booking_id: str) -> Optional[Dict]:
+        async def _get_booking_internal(tx):
+            query = """
+            MATCH (u:User)-[:MADE_BOOKING]->(b:Booking {id: $id})-[:FOR_ROOM]->(r:Room)
+            RETURN b, r, u.id as user_id
+            """
+            result = await tx.run(query, id=booking_id)
+            record = await result.single()
+            if record:
+                with phase("convert"):
+                    booking = _node_to_dict(record["b"])
+                    booking["room"] = _node_to_dict(record["r"])
+                booking["user_id"] = record["user_id"]
+                return booking
+            return None
 
         try:
-            return self._execute_with_retry(_get_booking_internal)
+            return await self._execute_with_retry("get_booking_by_id", self._read, _get_booking_internal)
         except Exception as e:
             logger.error(f"Database error in get_booking_by_id: {e}")
             return None
 
-    def update_booking(self, booking_id: str, updates: Dict):
-        def _update_booking_internal():
-            with self.driver.session() as session:
-                set_clause = ", ".join([f"b.{key} = ${key}" for key in updates.keys()])
-                query = f"MATCH (b:Booking {{id: $id}}) SET {set_clause} RETURN b"
-                session.run(query, id=booking_id, **updates)
+    async def update_booking(self, booking_id: str, updates: Dict):
+        props = _update_props(updates, BOOKING_UPDATE_FIELDS)
+        if not props:
+            return
+
+        async def _update_booking_internal(tx):
+            result = await tx.run(UPDATE_BOOKING_QUERY, id=booking_id, props=props)
+            return await result.single()
 
         try:
-            self._execute_with_retry(_update_booking_internal)
+            record = await self._execute_with_retry("update_booking", self._write, _update_booking_internal)
         except Exception as e:
             logger.error(f"Database error in update_booking: {e}")
             raise
 
-    def create_tenant(self, name: str, email: str, phone: str, room_id: str) -> str:
-        def _create_tenant_internal():
-            with self.driver.session() as session:
-                tenant_id = str(uuid.uuid4())
-                query = """
-                MATCH (r:Room {id: $room_id})
-                CREATE (t:Tenant {
-                    id: $id,
-                    name: $name,
-                    email: $email,
-                    phone: $phone,
-                    created_at: datetime()
+        if record is not None:
+            await publish_event("booking.updated", record["user_id"], booking_id=booking_id,
+                                status=record["status"], fields=sorted(props))
+
+    async def create_booking_request(self, user_id: str, room_id: str, start_date: date,
+                                     end_date: date, duration: int, message: str) -> Optional[str]:
+        """Create a pending booking and its admin notification in one write transaction.
+
+        Returns the booking id, None if the user or room does not exist, and
+        raises RoomUnavailableError if the room is under maintenance or has a
+        pending/approved booking overlapping [start_date, end_date).
+        """
+        booking_id = str(uuid.uuid4())
+        notification_id = str(uuid.uuid4())
+
+        async def _create_booking_request_tx(tx):
+            # Writing to the room takes its lock, so concurrent requests for
+            # the same room serialise here and the second sees the first booking
+            query = """
+            MATCH (u:User {id: $user_id}), (r:Room {id: $room_id})
+            SET r._lock = true
+            REMOVE r._lock
+            WITH u, r, r.status <> 'maintenance' AND NOT EXISTS {
+                MATCH (r)<-[:FOR_ROOM]-(other:Booking)
+                WHERE other.status IN ['pending', 'approved']
+                  AND other.start_date < date($end_date) AND date($start_date) < other.end_date
+            } AS bookable
+            FOREACH (_ IN CASE WHEN bookable THEN [1] ELSE [] END |
+                CREATE (b:Booking {
+                    id: $booking_id,
+                    start_date: date($start_date),
+                    end_date: date($end_date),
+                    duration: $duration,
+                    status: 'pending',
+                    created_at: datetime(),
+                    updated_at: datetime()
                 })
-                CREATE (t)-[:OCCUPIES]->(r)
-                RETURN t.id as id
-                """
-                result = session.run(query, id=tenant_id, name=name, email=email,
-                                   phone=phone, room_id=room_id)
-                return result.single()["id"]
+                CREATE (u)-[:MADE_BOOKING]->(b)
+                CREATE (b)-[:FOR_ROOM]->(r)
+                CREATE (n:Notification {
+                    id: $notification_id,
+                    message: $message,
+                    type: 'booking_request',
+                    status: 'pending',
+                    created_at: datetime(),
+                    updated_at: datetime()
+                })
+                CREATE (n)-[:FOR_USER]->(u)
+                CREATE (n)-[:ABOUT_BOOKING]->(b)
+            )
+            RETURN bookable
+            """
+            result = await tx.run(query, user_id=user_id, room_id=room_id, booking_id=booking_id,
+                                  notification_id=notification_id, start_date=start_date,
+                                  end_date=end_date, duration=duration, message=message)
+            record = await result.single()
+            return None if record is None else record["bookable"]
 
         try:
-            return self._execute_with_retry(_create_tenant_internal)
+            bookable = await self._execute_with_retry("create_booking_request", self._write, _create_booking_request_tx)
+        except Exception as e:
+            logger.error(f"Database error in create_booking_request: {e}")
+            raise Exception("Database connection unavailable. Please try again later.")
+
+        if bookable is None:
+            return None
+        if not bookable:
+            raise RoomUnavailableError("Room is not available")
+        await publish_event("notification.created", user_id, notification_id=notification_id,
+                            booking_id=booking_id, notification_type="booking_request", status="pending")
+        return booking_id
+
+    async def create_tenant(self, name: str, email: str, phone: str, room_id: str) -> str:
+        async def _create_tenant_internal(tx):
+            tenant_id = str(uuid.uuid4())
+            query = """
+            MATCH (r:Room {id: $room_id})
+            CREATE (t:Tenant {
+                id: $id,
+                name: $name,
+                email: $email,
+                phone: $phone,
+                created_at: datetime()
+            })
+            CREATE (t)-[:OCCUPIES]->(r)
+            RETURN t.id as id
+            """
+            result = await tx.run(query, id=tenant_id, name=name, email=email,
+                                  phone=phone, room_id=room_id)
+            return (await result.single())["id"]
+
+        try:
+            return await self._execute_with_retry("create_tenant", self._write, _create_tenant_internal)
         except Exception as e:
             logger.error(f"Database error in create_tenant: {e}")
             raise Exception("Database connection unavailable. Please try again later.")
 
-    def get_all_tenants(self) -> List[Dict]:
-        def _get_all_tenants_internal():
-            with self.driver.session() as session:
-                query = """
-                MATCH (t:Tenant)-[:OCCUPIES]->(r:Room)
-                RETURN t, r
-                ORDER BY t.name
-                """
-                result = session.run(query)
-                tenants = []
-                for record in result:
-                    tenant = self._convert_neo4j_types(dict(record["t"]))
-                    tenant["room"] = self._convert_neo4j_types(dict(record["r"]))
-                    tenants.append(tenant)
-                return tenants
+    async def get_all_tenants(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> List[TenantRow]:
+        params = _page_params(limit, cursor)
+
+        async def _get_all_tenants_internal(tx):
+            query = """
+            MATCH (t:Tenant)-[:OCCUPIES]->(r:Room)
+            WHERE $after_id IS NULL OR t.name > $after_key
+               OR (t.name = $after_key AND t.id > $after_id)
+            RETURN t, r
+            ORDER BY t.name, t.id
+            """ + _limit_clause(limit)
+            result = await tx.run(query, **params)
+            records = [record async for record in result]
+            with phase("convert"):
+                entries = []
+                for record in records:
+                    tenant = TenantRow.from_node(record["t"], room=RoomRow.from_node(record["r"]))
+                    entries.append((tenant, record["t"]["name"], record["t"]["id"]))
+                return _build_page(entries, limit)
 
         try:
-            return self._execute_with_retry(_get_all_tenants_internal)
+            return await self._execute_with_retry("get_all_tenants", self._read, _get_all_tenants_internal)
         except Exception as e:
             logger.error(f"Database error in get_all_tenants: {e}")
-            return []
+            return Page()
 
-    def create_notification(self, user_id: str, booking_id: str,
-                          message: str, notification_type: str) -> str:
-        def _create_notification_internal():
-            with self.driver.session() as session:
-                notification_id = str(uuid.uuid4())
-                query = """
-                MATCH (u:User {id: $user_id}), (b:Booking {id: $booking_id})
-                CREATE (n:Notification {
-                    id: $id,
-                    message: $message,
-                    type: $type,
-                    status: $status,
-                    created_at: datetime()
-                })
-                CREATE (n)-[:FOR_USER]->(u)
-                CREATE (n)-[:ABOUT_BOOKING]->(b)
-                RETURN n.id as id
-                """
-                result = session.run(query, id=notification_id, user_id=user_id,
-                                   booking_id=booking_id, message=message,
-                                   type=notification_type, status="pending")
-                return result.single()["id"]
+    async def create_notification(self, user_id: str, booking_id: str,
+                                  message: str, notification_type: str) -> str:
+        async def _create_notification_internal(tx):
+            notification_id = str(uuid.uuid4())
+            query = """
+            MATCH (u:User {id: $user_id}), (b:Booking {id: $booking_id})
+            CREATE (n:Notification {
+                id: $id,
+                message: $message,
+                type: $type,
+                status: $status,
+                created_at: datetime(),
+                updated_at: datetime()
+            })
+            CREATE (n)-[:FOR_USER]->(u)
+            CREATE (n)-[:ABOUT_BOOKING]->(b)
+            RETURN n.id as id
+            """
+            result = await tx.run(query, id=notification_id, user_id=user_id,
+                                  booking_id=booking_id, message=message,
+                                  type=notification_type, status="pending")
+            return (await result.single())["id"]
 
         try:
-            return self._execute_with_retry(_create_notification_internal)
+            notification_id = await self._execute_with_retry("create_notification", self._write, _create_notification_internal)
         except Exception as e:
             logger.error(f"Database error in create_notification: {e}")
             raise Exception("Database connection unavailable. Please try again later.")
 
-    def get_all_notifications(self) -> List[Dict]:
-        def _get_all_notifications_internal():
-            with self.driver.session() as session:
-                query = """
-                MATCH (n:Notification)-[:FOR_USER]->(u:User)
-                OPTIONAL MATCH (n)-[:ABOUT_BOOKING]->(b:Booking)
-                RETURN n, u, b
-                ORDER BY n.created_at DESC
-                """
-                result = session.run(query)
-                notifications = []
-                for record in result:
-                    notif = self._convert_neo4j_types(dict(record["n"]))
-                    notif["user"] = self._convert_neo4j_types(dict(record["u"]))
-                    if record["b"]:
-                        notif["booking_id"] = dict(record["b"])["id"]
-                    notifications.append(notif)
-                return notifications
+        await publish_event("notification.created", user_id, notification_id=notification_id,
+                            booking_id=booking_id, notification_type=notification_type, status="pending")
+        return notification_id
+
+    async def get_all_notifications(self, limit: Optional[int] = None, cursor: Optional[str] = None,
+                                    since: Optional[str] = None) -> List[NotificationRow]:
+        # A change feed (since given) resumes from its watermark instead of a page cursor
+        params = _page_params(limit, cursor if since is None else since)
+        where, order_by, sort_key = _feed_clauses("n", since)
+
+        async def _get_all_notifications_internal(tx):
+            query = """
+            MATCH (n:Notification)-[:FOR_USER]->(u:User)
+            WHERE """ + where + """
+            OPTIONAL MATCH (n)-[:ABOUT_BOOKING]->(b:Booking)
+            RETURN n, u, b.id AS booking_id
+            """ + order_by + " " + _limit_clause(limit)
+            result = await tx.run(query, **params)
+            records = [record async for record in result]
+            with phase("convert"):
+                entries = []
+                for record in records:
+                    notif = NotificationRow.from_node(record["n"], booking_id=record["booking_id"],
+                                                      user=UserSummaryRow.from_node(record["u"]))
+                    entries.append((notif, record["n"][sort_key], record["n"]["id"]))
+                return _build_page(entries, limit, since)
 
         try:
-            return self._execute_with_retry(_get_all_notifications_internal)
+            return await self._execute_with_retry("get_all_notifications", self._read, _get_all_notifications_internal)
         except Exception as e:
             logger.error(f"Database error in get_all_notifications: {e}")
-            return []
+            return Page()
+
+    async def get_user_notifications(self, user_id: str, limit: Optional[int] = None,
+                                     cursor: Optional[str] = None,
+                                     since: Optional[str] = None) -> List[NotificationRow]:
+        # A change feed (since given) resumes from its watermark instead of a page cursor
+        params = _page_params(limit, cursor if since is None else since)
+        where, order_by, sort_key = _feed_clauses("n", since)
 
-    def get_user_notifications(self, user_id: str) -> List[Dict]:
-        def _get_user_notifications_internal():
-            with self.driver.session() as session:
-                query = """
-                MATCH (n:Notification)-[:FOR_USER]->(u:User {id: $user_id})
-                OPTIONAL MATCH (n)-[:ABOUT_BOOKING]->(b:Booking)
-                RETURN n, b
-                ORDER BY n.created_at DESC
-                """
-                result = session.run(query, user_id=user_id)
-                notifications = []
-                for record in result:
-                    notif = self._convert_neo4j_types(dict(record["n"]))
-                    if record["b"]:
-                        notif["booking_id"] = dict(record["b"])["id"]
-                    notifications.append(notif)
-                return notifications
+        async def _get_user_notifications_internal(tx):
+            query = """
+            MATCH (n:Notification)-[:FOR_USER]->(u:User {id: $user_id})
+            WHERE """ + where + """
+            OPTIONAL MATCH (n)-[:ABOUT_BOOKING]->(b:Booking)
+            RETURN n, b.id AS booking_id
+            """ + order_by + " " + _limit_clause(limit)
+            result = await tx.run(query, user_id=user_id, **params)
+            records = [record async for record in result]
+            with phase("convert"):
+                entries = []
+                for record in records:
+                    notif = NotificationRow.from_node(record["n"], booking_id=record["booking_id"])
+                    entries.append((notif, record["n"][sort_key], record["n"]["id"]))
+                return _build_page(entries, limit, since)
 
         try:
-            return self._execute_with_retry(_get_user_notifications_internal)
+            return await self._execute_with_retry("get_user_notifications", self._read, _get_user_notifications_internal)
         except Exception as e:
             logger.error(f"Database error in get_user_notifications: {e}")
-            return []
+            return Page()
 
-    def get_notification_by_id(self, notification_id: str) -> Optional[Dict]:
-        def _get_notification_internal():
-            with self.driver.session() as session:
-                query = """
-                MATCH (n:Notification {id: $id})
-                OPTIONAL MATCH (n)-[:ABOUT_BOOKING]->(b:Booking)
-                RETURN n, b.id as booking_id
-                """
-                result = session.run(query, id=notification_id)
-                record = result.single()
-                if record:
-                    notif = self._convert_neo4j_types(dict(record["n"]))
-                    if record["booking_id"]:
-                        notif["booking_id"] = record["booking_id"]
-                    return notif
-                return None
+    async def get_notification_by_id(self, notification_id: str) -> Optional[Dict]:
+        async def _get_notification_internal(tx):
+            query = """
+            MATCH (n:Notification {id: $id})
+            OPTIONAL MATCH (n)-[:ABOUT_BOOKING]->(b:Booking)
+            RETURN n, b.id as booking_id
+            """
+            result = await tx.run(query, id=notification_id)
+            record = await result.single()
+            if record:
+                with phase("convert"):
+                    notif = _node_to_dict(record["n"])
+                if record["booking_id"]:
+                    notif["booking_id"] = record["booking_id"]
+                return notif
+            return None
 
         try:
-            return self._execute_with_retry(_get_notification_internal)
+            return await self._execute_with_retry("get_notification_by_id", self._read, _get_notification_internal)
         except Exception as e:
             logger.error(f"Database error in get_notification_by_id: {e}")
             return None
 
-    def update_notification(self, notification_id: str, updates: Dict):
-        def _update_notification_internal():
-            with self.driver.session() as session:
-                set_clause = ", ".join([f"n.{key} = ${key}" for key in updates.keys()])
-                query = f"MATCH (n:Notification {{id: $id}}) SET {set_clause} RETURN n"
-                session.run(query, id=notification_id, **updates)
+    async def update_notification(self, notification_id: str, updates: Dict):
+        props = _update_props(updates, NOTIFICATION_UPDATE_FIELDS)
+        if not props:
+            return
+
+        async def _update_notification_internal(tx):
+            result = await tx.run(UPDATE_NOTIFICATION_QUERY, id=notification_id, props=props)
+            return await result.single()
 
         try:
-            self._execute_with_retry(_update_notification_internal)
+            record = await self._execute_with_retry("update_notification", self._write, _update_notification_internal)
         except Exception as e:
             logger.error(f"Database error in update_notification: {e}")
             raise
+
+        if record is not None:
+            await publish_event("notification.updated", record["user_id"],
+                                notification_id=notification_id, status=record["status"])
+
+    async def approve_booking(self, notification_id: str) -> Optional[Dict]:
+        """Approve the booking behind a notification and mark its room occupied"""
+        return await self._resolve_booking(notification_id, "approved")
+
+    async def reject_booking(self, notification_id: str) -> Optional[Dict]:
+        """Reject the booking behind a notification"""
+        return await self._resolve_booking(notification_id, "rejected")
+
+    async def _resolve_booking(self, notification_id: str, status: str) -> Optional[Dict]:
+        """Update notification, booking and room in one write transaction.
+
+        Returns {"booking": ..., "room": ...}, or None when the notification
+        does not reference a booking.
+        """
+        method = "approve_booking" if status == "approved" else "reject_booking"
+
+        async def _resolve_booking_tx(tx):
+            query = """
+            MATCH (n:Notification {id: $id})-[:ABOUT_BOOKING]->(b:Booking)-[:FOR_ROOM]->(r:Room)
+            MATCH (u:User)-[:MADE_BOOKING]->(b)
+            SET n.status = $status, b.status = $status,
+                n.updated_at = datetime(), b.updated_at = datetime(),
+                r.status = CASE WHEN $status = 'approved' THEN 'occupied' ELSE r.status END,
+                r.updated_at = CASE WHEN $status = 'approved' THEN datetime() ELSE r.updated_at END
+            RETURN b, r, u.id as user_id
+            """
+            result = await tx.run(query, id=notification_id, status=status)
+            record = await result.single()
+            if record is None:
+                return None
+            with phase("convert"):
+                booking = _node_to_dict(record["b"])
+                room = _node_to_dict(record["r"])
+            booking["user_id"] = record["user_id"]
+            return {"booking": booking, "room": room}
+
+        try:
+            resolved = await self._execute_with_retry(method, self._write, _resolve_booking_tx)
+            if resolved and status == "approved":
+                room_cache.clear()
+        except Exception as e:
+            logger.error(f"Database error in _resolve_booking: {e}")
+            raise
+
+        if resolved:
+            booking = resolved["booking"]
+            await publish_event(f"booking.{status}", booking["user_id"], booking_id=booking["id"],
+                                notification_id=notification_id, room_id=resolved["room"]["id"],
+                                status=status)
+        return resolved
+
+    # ---- Bulk import ----
+
+    async def _bulk_create(self, method: str, query: str, rows: List[Dict], chunk_size: int) -> int:
+        created = 0
+        for chunk in _chunks(rows, chunk_size):
+            async def _bulk_create_internal(tx, chunk=chunk):
+                result = await tx.run(query, rows=chunk)
+                return (await result.single())["created"]
+
+            created += await self._execute_with_retry(method, self._write, _bulk_create_internal)
+        return created
+
+    async def bulk_create_rooms(self, rows: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+        """Create rooms in UNWIND batches, skipping room numbers that already exist"""
+        started = time.perf_counter()
+        try:
+            created = await self._bulk_create("bulk_create_rooms", BULK_CREATE_ROOMS_QUERY, _room_import_rows(rows), chunk_size)
+            room_cache.clear()
+            return _bulk_result(len(rows), created, time.perf_counter() - started)
+        except Exception as e:
+            logger.error(f"Database error in bulk_create_rooms: {e}")
+            raise
+
+    async def bulk_create_users(self, rows: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+        """Create users in UNWIND batches; rows carry plain passwords, existing emails are skipped"""
+        from auth import hash_passwords_async
+
+        async def _existing_emails_internal(tx):
+            result = await tx.run(EXISTING_USER_EMAILS_QUERY, emails=[row["email"] for row in rows])
+            return {record["email"] async for record in result}
+
+        started = time.perf_counter()
+        try:
+            existing = await self._execute_with_retry("bulk_create_users", self._read, _existing_emails_internal)
+            new_rows = [row for row in _dedupe(rows, "email") if row["email"] not in existing]
+            # Only new users are hashed; bcrypt dominates the cost of a user import
+            hashes = await hash_passwords_async([row["password"] for row in new_rows])
+            new_rows = [
+                {"role": "user", **row, "password": hashed, "id": str(uuid.uuid4())}
+                for row, hashed in zip(new_rows, hashes)
+            ]
+            created = await self._bulk_create("bulk_create_users", BULK_CREATE_USERS_QUERY, new_rows, chunk_size)
+            return _bulk_result(len(rows), created, time.perf_counter() - started)
+        except Exception as e:
+            logger.error(f"Database error in bulk_create_users: {e}")
+            raise
+
+    async def bulk_create_tenants(self, rows: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+        """Create tenants in UNWIND batches; rows without a matching room or with a known email are skipped"""
+        started = time.perf_counter()
+        try:
+            created = await self._bulk_create("bulk_create_tenants", BULK_CREATE_TENANTS_QUERY, _tenant_import_rows(rows), chunk_size)
+            return _bulk_result(len(rows), created, time.perf_counter() - started)
+        except Exception as e:
+            logger.error(f"Database error in bulk_create_tenants: {e}")
+            raise
+
+    # ---- Streaming export ----
+
+    async def stream_export(self, kind: str) -> AsyncIterator[Dict]:
+        """Yield flat export rows as the driver fetches them, EXPORT_FETCH_SIZE at a time.
+
+        Not retried: once rows have been handed out a restart would repeat them.
+        """
+        columns, query = EXPORTS[kind]
+        async with self._session(READ_ACCESS, fetch_size=EXPORT_FETCH_SIZE) as session:
+            result = await session.run(query)
+            async for record in result:
+                yield _export_row(columns, record)
+
+
+class Neo4jConnection:
+    """Blocking facade over AsyncNeo4jConnection for scripts (init_database.py,
+    create_admin.py, test_db.py...).
+
+    Every coroutine method of the async class is run to completion on a private
+    event loop, so the queries, transaction functions and row mapping exist only
+    once. Not for use from code already running in an event loop (the API).
+    """
+
+    def __init__(self, uri: str, user: str, password: str, database: Optional[str] = None):
+        self._repository = AsyncNeo4jConnection(uri, user, password, database)
+        self._loop = asyncio.new_event_loop()
+
+    def __getattr__(self, name):
+        # Only reached for names not defined here
+        attr = getattr(self._repository, name)
+        if inspect.iscoroutinefunction(attr):
+            return lambda *args, **kwargs: self._run(attr(*args, **kwargs))
+        if inspect.isasyncgenfunction(attr):
+            return lambda *args, **kwargs: self._iterate(attr(*args, **kwargs))
+        return attr
+
+    def _run(self, coroutine):
+        return self._loop.run_until_complete(coroutine)
+
+    def _iterate(self, iterator: AsyncIterator) -> Iterator:
+        try:
+            while True:
+                try:
+                    yield self._run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._run(iterator.aclose())
+
+    def query(self, cypher: str, **params) -> List[Dict]:
+        """Run an ad-hoc read query (script diagnostics) and return its records as dicts"""
+        async def _query_tx(tx):
+            result = await tx.run(cypher, **params)
+            return await result.data()
+
+        return self._run(self._repository._read(_query_tx))
+
+
+# Process-wide connection shared by the API routes and authentication
+_shared_connection = None
+
+def get_shared_connection() -> Repository:
+    """Return the process-wide Repository chosen by STORAGE_BACKEND.
+
+    "neo4j" (default) gives the pooled AsyncNeo4jConnection; "memory" gives the
+    in-process InMemoryRepository. Backends are set up lazily by connect(), so
+    callers should check ``connected`` before the first query.
+    """
+    global _shared_connection
+    if _shared_connection is None:
+        backend = os.getenv("STORAGE_BACKEND", "neo4j").lower()
+        if backend == "memory":
+            from memory_repository import InMemoryRepository
+            _shared_connection = InMemoryRepository()
+        else:
+            if backend != "neo4j":
+                logger.warning(f"Unknown STORAGE_BACKEND '{backend}', using neo4j")
+            _shared_connection = AsyncNeo4jConnection(
+                uri=os.getenv("NEO4J_URI"),
+                user=os.getenv("NEO4J_USERNAME"),
+                password=os.getenv("NEO4J_PASSWORD")
+            )
+    return _shared_connection
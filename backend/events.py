@@ -0,0 +1,103 @@
+"""
+Notification events pushed to connected clients (see /api/events).
+
+The database layer publishes an event after each committed notification or
+booking status change. Every subscriber gets events addressed to its own user
+id, and admins get all of them. The broker is selected by EVENT_BROKER. Only the
+in-process "memory" broker ships here; it fans out within one worker process.
+Multi-worker deployments plug a broker with the same publish/subscribe surface
+into get_broker().
+"""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+import asyncio
+import logging
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before it is considered too slow to keep up
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+
+
+class Subscription:
+    """One connected client: a bounded queue plus the audience it belongs to"""
+
+    def __init__(self, user_id: str, is_admin: bool, maxsize: int):
+        self.user_id = user_id
+        self.is_admin = is_admin
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def wants(self, event: Dict) -> bool:
+        return self.is_admin or event.get("user_id") == self.user_id
+
+    def offer(self, event: Dict):
+        """Queue without blocking; a lagging client gets a single resync instead"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+    async def get(self, timeout: float) -> Optional[Dict]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    """Fan-out to subscribers in this process; publish never blocks on slow clients"""
+
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions: Set[Subscription] = set()
+        self.published = 0
+
+    async def publish(self, event: Dict):
+        self.published += 1
+        for subscription in list(self._subscriptions):
+            if subscription.wants(event):
+                subscription.offer(event)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str, is_admin: bool = False) -> AsyncIterator[Subscription]:
+        subscription = Subscription(user_id, is_admin, self.queue_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+
+BROKERS = {
+    "memory": InProcessBroker,
+}
+
+_broker = None
+
+def get_broker():
+    """Return the process-wide broker chosen by EVENT_BROKER (default "memory")"""
+    global _broker
+    if _broker is None:
+        name = os.getenv("EVENT_BROKER", "memory").lower()
+        if name not in BROKERS:
+            logger.warning(f"Unknown EVENT_BROKER '{name}', using in-process broker")
+            name = "memory"
+        _broker = BROKERS[name]()
+    return _broker
+
+
+async def publish_event(event_type: str, user_id: Optional[str], **fields):
+    """Publish after a commit; a failing broker never fails the write that triggered it"""
+    try:
+        await get_broker().publish({"type": event_type, "user_id": user_id, **fields})
+    except Exception as e:
+        logger.warning(f"Could not publish {event_type} event: {e}")
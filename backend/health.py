@@ -0,0 +1,117 @@
+"""
+Background database health monitor behind the /health probes.
+
+A single task pings the storage backend every HEALTH_CHECK_INTERVAL_SECONDS
+and caches the outcome. Probes only read that cached state. They never open
+a session or wait on the driver, so a burst of probes costs no pool
+connections, and during an outage they answer at once instead of blocking
+for the driver's connection timeout.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+import asyncio
+import logging
+import os
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "15"))
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "5"))
+# A cached result older than this no longer counts as ready (e.g. the monitor is stuck)
+HEALTH_STALE_AFTER_SECONDS = float(
+    os.getenv("HEALTH_STALE_AFTER_SECONDS", str(HEALTH_CHECK_INTERVAL_SECONDS * 3))
+)
+
+
+class HealthMonitor:
+    """Periodically pings a Repository and keeps the latest result"""
+
+    def __init__(self, repository, interval: float = HEALTH_CHECK_INTERVAL_SECONDS,
+                 timeout: float = HEALTH_CHECK_TIMEOUT_SECONDS,
+                 stale_after: float = HEALTH_STALE_AFTER_SECONDS):
+        self.repository = repository
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.started_at = time.monotonic()
+        self.status = "unknown"
+        self.error: Optional[str] = None
+        self.latency: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.last_healthy_at: Optional[float] = None
+        self.consecutive_failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self):
+        """Ping once (bounded by the timeout) and record the result"""
+        started = time.monotonic()
+        try:
+            if not self.repository.connected:
+                self.repository.connect()
+            healthy = await asyncio.wait_for(self.repository.ping(), timeout=self.timeout)
+            status, error = ("healthy", None) if healthy else ("unhealthy", "Unexpected ping result")
+        except asyncio.TimeoutError:
+            status, error = "unhealthy", f"Ping timed out after {self.timeout:g}s"
+        except Exception as e:
+            status, error = "unhealthy", str(e)
+
+        self.checked_at = time.monotonic()
+        self.latency = self.checked_at - started
+        if status == "healthy":
+            self.last_healthy_at = self.checked_at
+            if self.consecutive_failures:
+                logger.info(f"✅ Database healthy again after {self.consecutive_failures} failed checks")
+            self.consecutive_failures = 0
+        else:
+            if self.consecutive_failures == 0:
+                logger.warning(f"⚠️ Database health check failed: {error}")
+            self.consecutive_failures += 1
+        self.status, self.error = status, error
+
+    async def _run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def age(self) -> Optional[float]:
+        return None if self.checked_at is None else time.monotonic() - self.checked_at
+
+    @property
+    def ready(self) -> bool:
+        age = self.age()
+        return self.status == "healthy" and age is not None and age <= self.stale_after
+
+    def uptime(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def snapshot(self) -> Dict:
+        """Cached database status for the readiness probe"""
+        age = self.age()
+        since_healthy = None if self.last_healthy_at is None else time.monotonic() - self.last_healthy_at
+        return {
+            "status": "ready" if self.ready else "not_ready",
+            "database": "stale" if self.status == "healthy" and not self.ready else self.status,
+            "last_check_age_seconds": None if age is None else round(age, 3),
+            "latency_ms": None if self.latency is None else round(self.latency * 1e3, 2),
+            "last_healthy_seconds_ago": None if since_healthy is None else round(since_healthy, 3),
+            "consecutive_failures": self.consecutive_failures,
+            "error": self.error,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
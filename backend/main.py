@@ -1,16 +1,22 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, status, Request, Query, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
-from datetime import datetime, timedelta
-from typing import Optional, List
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from datetime import datetime, timedelta, date
+from typing import Optional, List, Literal, Dict, AsyncIterator
 import uvicorn
 import os
+import io
+import csv
+import json
+import hashlib
 import logging
 import sys
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
+from pydantic import TypeAdapter
 
 # Configure logging first
 logging.basicConfig(
@@ -23,17 +29,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Local imports
-from database import Neo4jConnection
+from database import (
+    get_shared_connection, get_driver_count, InvalidCursorError, RoomUnavailableError,
+    RoomRow, BookingRow, TenantRow, NotificationRow, BULK_CHUNK_SIZE, EXPORTS
+)
 from models import (
     User, UserCreate, UserLogin, Token,
     Booking, BookingCreate, BookingUpdate,
     Room, RoomCreate, RoomUpdate,
     Tenant, TenantCreate,
-    Notification, NotificationUpdate
+    Notification, NotificationUpdate, ImportResult
 )
+from bulk_import import ImportReport, import_format, aiter_upload_rows
+from cache import room_cache, user_cache
+from events import get_broker
+from timing import REQUEST_TIMING, ServerTimingMiddleware, phase
+import metrics
+from health import HealthMonitor
 from auth import (
-    verify_password, get_password_hash, create_access_token,
-    decode_access_token, get_current_user, get_current_admin
+    verify_password_async, create_access_token, decode_access_token, create_event_ticket,
+    get_current_user, get_current_admin, get_event_ticket_user, shutdown_password_pool,
+    get_password_pool_stats, EVENT_TICKET_EXPIRE_SECONDS
 )
 
 # Configure logging
@@ -49,27 +65,21 @@ logger.info(f"🔗 Neo4j Username: {os.getenv('NEO4J_USERNAME', 'N/A')}")
 logger.info(f"🔗 JWT Secret Key configured: {'Yes' if os.getenv('JWT_SECRET_KEY') else 'No'}")
 
 # ✅ Database connection - Make it lazy to avoid import-time issues
-_db_instance = None
-
 def get_database():
-    """Get database connection - lazy initialization"""
-    global _db_instance
-    if _db_instance is None:
-        _db_instance = Neo4jConnection(
-            uri=os.getenv("NEO4J_URI"),
-            user=os.getenv("NEO4J_USERNAME"),
-            password=os.getenv("NEO4J_PASSWORD")
-        )
-    return _db_instance
+    """Get the process-wide database connection (shared with auth)"""
+    return get_shared_connection()
 
 # Create database instance but don't connect yet
 db = get_database()
 
+# Pings the database in the background; /health probes read its cached result
+health_monitor = HealthMonitor(db)
+
 # Database dependency - handle connection errors gracefully
-def get_database_dependency():
+async def get_database_dependency():
     try:
         # Ensure database is connected
-        if db.driver is None:
+        if not db.connected:
             logger.info("🔗 Connecting to database...")
             db.connect()
         return db
@@ -86,17 +96,20 @@ async def lifespan(app: FastAPI):
 
     try:
         # Connect to database with timeout
-        logger.info(f"🔗 Connecting to Neo4j Aura at: {os.getenv('NEO4J_URI', 'N/A')}")
+        if os.getenv("STORAGE_BACKEND", "neo4j").lower() == "memory":
+            logger.info("🧠 Using the in-memory storage backend (data is not persisted)")
+        else:
+            logger.info(f"🔗 Connecting to Neo4j Aura at: {os.getenv('NEO4J_URI', 'N/A')}")
 
         # Use a timeout for database connection
         import asyncio
 
         async def connect_with_timeout():
             try:
-                # Try to connect with a reasonable timeout
-                loop = asyncio.get_event_loop()
-                result = await asyncio.wait_for(
-                    loop.run_in_executor(None, db.connect),
+                # Creating the async driver is cheap; verify it can reach Aura
+                db.connect()
+                await asyncio.wait_for(
+                    db.verify_connectivity(),
                     timeout=30.0  # 30 second timeout for initial connection
                 )
                 return True
@@ -113,9 +126,8 @@ async def lifespan(app: FastAPI):
 
             # Test database connectivity (non-blocking)
             try:
-                loop = asyncio.get_event_loop()
                 test_result = await asyncio.wait_for(
-                    loop.run_in_executor(None, test_database_connection),
+                    test_database_connection(),
                     timeout=15.0  # Increased from 5.0 to 15.0
                 )
                 if test_result:
@@ -129,12 +141,27 @@ async def lifespan(app: FastAPI):
 
             # Create constraints (non-blocking)
             try:
-                loop = asyncio.get_event_loop()
                 await asyncio.wait_for(
-                    loop.run_in_executor(None, db.create_constraints),
+                    db.create_constraints(),
                     timeout=15.0  # Increased from 5.0 to 15.0
                 )
                 logger.info("🔒 Database constraints created/verified")
+
+                report = await asyncio.wait_for(db.index_report(), timeout=15.0)
+                if report is not None:
+                    logger.info(f"🗂️ Indexes online: {len(report['online'])}")
+                    if report["populating"]:
+                        logger.info(f"⏳ Indexes still populating: {', '.join(report['populating'])}")
+                    if report["missing"]:
+                        logger.warning(f"⚠️ Indexes missing: {', '.join(report['missing'])}")
+
+                migrated = await asyncio.wait_for(db.migrate_booking_dates(), timeout=15.0)
+                if migrated:
+                    logger.info(f"📅 Converted {migrated} bookings to native date ranges")
+
+                backfilled = await asyncio.wait_for(db.backfill_updated_at(), timeout=15.0)
+                if backfilled:
+                    logger.info(f"🕒 Stamped updated_at on {backfilled} bookings/notifications")
             except asyncio.TimeoutError:
                 logger.warning("⚠️ Database constraint creation timed out")
             except Exception as constraint_error:
@@ -143,9 +170,8 @@ async def lifespan(app: FastAPI):
 
             # Ensure admin user exists
             try:
-                loop = asyncio.get_event_loop()
                 await asyncio.wait_for(
-                    loop.run_in_executor(None, ensure_admin_user),
+                    ensure_admin_user(),
                     timeout=15.0  # Increased from 5.0 to 15.0
                 )
                 logger.info("👑 Admin user verified/created")
@@ -164,29 +190,29 @@ async def lifespan(app: FastAPI):
         import traceback
         logger.error(f"Full traceback: {traceback.format_exc()}")
 
+    health_monitor.start()
     logger.info("🎉 Application startup complete!")
     yield
 
     # Shutdown
     logger.info("🔌 Shutting down application...")
+    await health_monitor.stop()
+    shutdown_password_pool()
     try:
-        db.close()
+        await db.close()
     except Exception as e:
         logger.warning(f"⚠️ Error closing database connection: {e}")
         logger.info("ℹ️ Application shutdown complete")
 
-def test_database_connection():
+async def test_database_connection():
     """Test database connection"""
     try:
-        with db.driver.session() as session:
-            result = session.run("RETURN 'Database operational' as status")
-            record = result.single()
-            return record['status'] == 'Database operational'
+        return await db.ping()
     except Exception as e:
         logger.error(f"Database test failed: {e}")
         return False
 
-def ensure_admin_user():
+async def ensure_admin_user():
     """Ensure admin user exists with fixed credentials"""
     try:
         # Use environment variables for admin credentials
@@ -196,14 +222,14 @@ def ensure_admin_user():
         admin_role = "admin"
 
         # Check if admin user exists
-        existing_admin = db.get_user_by_email(admin_email)
+        existing_admin = await db.get_user_by_email(admin_email)
 
         if existing_admin:
             logger.info("✅ Admin user already exists")
             return True
 
         # Create admin user with credentials from environment
-        admin_id = db.create_user(admin_email, admin_username, admin_password, admin_role)
+        admin_id = await db.create_user(admin_email, admin_username, admin_password, admin_role)
 
         logger.info(f"✅ Admin user created successfully with ID: {admin_id}")
         return True
@@ -212,7 +238,72 @@ def ensure_admin_user():
         logger.error(f"❌ Error creating admin user: {e}")
         return False
 
-app = FastAPI(title="Boardinghouse Management System", lifespan=lifespan)
+# ✅ Response encoding - orjson by default (handles datetime natively), stdlib json as fallback.
+# The default class only renders: a route returning dicts or models still pays FastAPI's
+# jsonable_encoder pass first, and then shows no measurable gain over the stdlib encoder.
+# The ~70x "orjson direct" case needs a pre-serialized Response: rows_response() for
+# the list endpoints, json_response() for other hot dict payloads.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_ENCODER = os.getenv("JSON_ENCODER", "orjson").lower()
+if JSON_ENCODER == "orjson" and orjson is None:
+    logger.warning("⚠️ JSON_ENCODER=orjson but orjson is not installed, using stdlib json")
+    JSON_ENCODER = "json"
+APIJSONResponse = ORJSONResponse if JSON_ENCODER == "orjson" else JSONResponse
+logger.info(f"🧾 JSON encoder: {JSON_ENCODER}")
+
+def dump_json(content) -> bytes:
+    """Serialize plain dicts/lists (with datetime values) using the configured encoder"""
+    if JSON_ENCODER == "orjson":
+        return orjson.dumps(content)
+    return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+
+app = FastAPI(
+    title="Boardinghouse Management System",
+    lifespan=lifespan,
+    default_response_class=APIJSONResponse
+)
+
+# Largest page a client may request from the paginated list endpoints
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return APIJSONResponse(status_code=400, content={"detail": str(exc)})
+
+def set_next_cursor(response: Response, rows):
+    """Expose the cursor for the following page, if any, as X-Next-Cursor,
+    and a change feed's watermark for the next ?since= as X-Sync-Watermark"""
+    next_cursor = getattr(rows, "next_cursor", None)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    watermark = getattr(rows, "watermark", None)
+    if watermark is not None:
+        response.headers["X-Sync-Watermark"] = watermark
+
+# Built once: serialize typed rows straight to JSON without jsonable_encoder
+room_adapter = TypeAdapter(RoomRow)
+room_list_adapter = TypeAdapter(List[RoomRow])
+booking_list_adapter = TypeAdapter(List[BookingRow])
+tenant_list_adapter = TypeAdapter(List[TenantRow])
+notification_list_adapter = TypeAdapter(List[NotificationRow])
+
+def json_response(content) -> Response:
+    """Pre-serialized JSON response for a plain dict, skipping jsonable_encoder"""
+    with phase("encode"):
+        body = dump_json(content)
+    return Response(content=body, media_type="application/json")
+
+def rows_response(adapter: TypeAdapter, rows) -> Response:
+    """JSON response for a list of rows; absent (None) properties are omitted"""
+    with phase("encode"):
+        body = adapter.dump_json(rows, exclude_none=True)
+    response = Response(content=body, media_type="application/json")
+    set_next_cursor(response, rows)
+    return response
 
 # ✅ CORS middleware - Environment-aware configuration
 def get_cors_origins():
@@ -240,8 +331,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Sync-Watermark", "Server-Timing"],
 )
 
+# ⏱️ Per-phase request timings (Server-Timing header + log fields) when REQUEST_TIMING is on
+if REQUEST_TIMING:
+    app.add_middleware(ServerTimingMiddleware)
+
+# 📈 Route latency histograms and in-flight count for /metrics
+if metrics.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+    if not metrics.METRICS_TOKEN:
+        logger.warning("⚠️ METRICS_ENABLED without METRICS_TOKEN: /metrics is readable by anyone")
+
 @app.post("/api/auth/register", response_model=Token)
 async def register(user: UserCreate, database = Depends(get_database_dependency)):
     try:
@@ -249,7 +351,7 @@ async def register(user: UserCreate, database = Depends(get_database_dependency)
 
         # Check if user exists - handle errors gracefully
         try:
-            existing_user = database.get_user_by_email(user.email)
+            existing_user = await database.get_user_by_email(user.email)
             if existing_user:
                 logger.warning(f"Registration failed - email already exists: {user.email}")
                 raise HTTPException(status_code=400, detail="Email already registered")
@@ -266,7 +368,7 @@ async def register(user: UserCreate, database = Depends(get_database_dependency)
             raise HTTPException(status_code=400, detail="Email, username, and password are required")
 
         try:
-            user_id = database.create_user(user.email, user.username, user.password, user.role)
+            user_id = await database.create_user(user.email, user.username, user.password, user.role)
             logger.info(f"User created successfully with ID: {user_id}")
         except HTTPException:
             raise  # Re-raise HTTP exceptions from database
@@ -304,7 +406,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), database = Dep
 
         # Get user from database
         try:
-            user = database.get_user_by_email(form_data.username)
+            user = await database.get_user_by_email(form_data.username)
             logger.info(f"User lookup result: {'Found' if user else 'Not found'}")
         except Exception as db_error:
             logger.error(f"Database error during user lookup: {db_error}")
@@ -320,8 +422,10 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), database = Dep
 
         # Verify password
         try:
-            password_valid = verify_password(form_data.password, user["password"])
+            password_valid = await verify_password_async(form_data.password, user["password"])
             logger.info(f"Password verification result: {password_valid}")
+        except HTTPException:
+            raise  # Password pool saturated - surface the 503
         except Exception as pw_error:
             logger.error(f"Password verification error: {pw_error}")
             raise HTTPException(status_code=500, detail="Password verification failed")
@@ -366,7 +470,7 @@ async def register_admin(
 
         # Check if user exists - handle errors gracefully
         try:
-            existing_user = database.get_user_by_email(user.email)
+            existing_user = await database.get_user_by_email(user.email)
             if existing_user:
                 logger.warning(f"Admin registration failed - email already exists: {user.email}")
                 raise HTTPException(status_code=400, detail="Email already registered")
@@ -384,7 +488,7 @@ async def register_admin(
 
         # Create user
         try:
-            user_id = database.create_user(user.email, user.username, user.password, user.role)
+            user_id = await database.create_user(user.email, user.username, user.password, user.role)
             logger.info(f"Admin user created successfully with ID: {user_id}")
         except HTTPException:
             raise  # Re-raise HTTP exceptions from database
@@ -414,13 +518,13 @@ async def register_admin(
 async def get_me(current_user: dict = Depends(get_current_user)):
     """Get current user profile"""
     try:
-        return {
+        return json_response({
             "id": current_user["id"],
             "email": current_user["email"],
             "username": current_user["username"],
             "role": current_user["role"],
             "created_at": current_user["created_at"]
-        }
+        })
     except Exception as e:
         logger.error(f"Error fetching user profile: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch user profile")
@@ -429,13 +533,13 @@ async def get_me(current_user: dict = Depends(get_current_user)):
 async def get_me_full(current_user: dict = Depends(get_current_user)):
     """Get current user profile - full version"""
     try:
-        return {
+        return json_response({
             "id": current_user["id"],
             "email": current_user["email"],
             "username": current_user["username"],
             "role": current_user["role"],
             "created_at": current_user["created_at"]
-        }
+        })
     except Exception as e:
         logger.error(f"Error fetching user profile: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch user profile")
@@ -445,36 +549,79 @@ async def get_me_full(current_user: dict = Depends(get_current_user)):
 # ============================================
 
 @app.get("/health")
-async def health_check(database = Depends(get_database_dependency)):
-    """Health check endpoint for deployment monitoring"""
-    try:
-        # Test database connection
-        db_status = "healthy"
-        try:
-            if database is None:
-                db_status = "unavailable"
-            else:
-                with database.driver.session() as session:
-                    result = session.run("RETURN 'Database operational' as status")
-                    record = result.single()
-                    if record['status'] != 'Database operational':
-                        db_status = "unhealthy"
-        except Exception as e:
-            logger.error(f"Health check database error: {e}")
-            db_status = "unhealthy"
-
-        return {
-            "status": "healthy" if db_status == "healthy" else "unhealthy",
-            "database": db_status,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    except Exception as e:
-        logger.error(f"Health check error: {e}")
-        return {
-            "status": "unhealthy",
-            "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+async def health_check():
+    """Health summary for deployment monitoring, answered from the cached DB check"""
+    snapshot = health_monitor.snapshot()
+    return {
+        "status": "healthy" if health_monitor.ready else "unhealthy",
+        "database": snapshot["database"],
+        "drivers": get_driver_count(),
+        "last_check_age_seconds": snapshot["last_check_age_seconds"],
+        "timestamp": snapshot["timestamp"],
+    }
+
+
+@app.get("/health/live")
+async def liveness_probe():
+    """Process is up and serving; never touches the database"""
+    return {"status": "alive", "uptime_seconds": round(health_monitor.uptime(), 1)}
+
+
+@app.get("/health/ready")
+async def readiness_probe():
+    """200 while the last background DB check passed and is fresh, else 503"""
+    snapshot = health_monitor.snapshot()
+    return APIJSONResponse(snapshot, status_code=200 if health_monitor.ready else 503)
+
+def collect_runtime_metrics():
+    """Scrape-time gauges and counters owned by auth, the caches, the broker and the driver"""
+    pool = get_password_pool_stats()
+    yield "password_hash_pending", "gauge", "bcrypt jobs queued or running", [({}, pool["pending"])]
+    yield "password_hash_workers", "gauge", "bcrypt pool threads", [({}, pool["workers"])]
+    yield "password_hash_max_pending", "gauge", "Queue depth at which logins get 503", [({}, pool["max_pending"])]
+    yield "password_hash_completed_total", "counter", "bcrypt jobs finished", [({}, pool["completed"])]
+    yield "password_hash_rejected_total", "counter", "bcrypt jobs shed with 503", [({}, pool["rejected"])]
+    yield "password_hash_seconds_total", "counter", "Time spent hashing/verifying", [({}, pool["hash_seconds_total"])]
+    yield ("password_hash_queue_wait_seconds_total", "counter", "Time bcrypt jobs waited for a worker",
+           [({}, pool["queue_wait_seconds_total"])])
+
+    caches = {"user": user_cache, "room": room_cache}
+    yield "cache_hits_total", "counter", "Cache lookups served", [({"cache": k}, c.hits) for k, c in caches.items()]
+    yield "cache_misses_total", "counter", "Cache lookups missed", [({"cache": k}, c.misses) for k, c in caches.items()]
+    yield "cache_entries", "gauge", "Entries currently cached", [({"cache": k}, len(c)) for k, c in caches.items()]
+    yield "cache_hit_ratio", "gauge", "hits / (hits + misses) since start", [
+        ({"cache": k}, c.hits / (c.hits + c.misses)) for k, c in caches.items() if c.hits + c.misses
+    ]
+
+    broker = get_broker()
+    yield "events_subscribers", "gauge", "Open /api/events streams", [({}, broker.subscriber_count())]
+    yield "events_published_total", "counter", "Events published to the broker", [({}, broker.published)]
+
+    yield "db_drivers", "gauge", "Open Neo4j drivers in this process", [({}, get_driver_count())]
+    yield "db_health_up", "gauge", "1 if the last background DB check passed and is fresh", [({}, int(health_monitor.ready))]
+    yield "db_health_check_age_seconds", "gauge", "Seconds since the last background DB check", [({}, health_monitor.age())]
+    yield ("db_health_check_latency_seconds", "gauge", "Duration of the last background DB check",
+           [({}, health_monitor.latency)])
+    pool_stats = db.pool_stats()
+    if pool_stats:
+        yield "db_pool_connections", "gauge", "Driver pool connections by state", [
+            ({"state": state}, pool_stats[state]) for state in ("open", "in_use", "opening")
+        ]
+        yield "db_pool_max_size", "gauge", "Driver pool size limit", [({}, pool_stats["max_size"])]
+        yield ("db_pool_utilization", "gauge", "In-use connections / pool size",
+               [({}, pool_stats["in_use"] / pool_stats["max_size"])])
+
+metrics.register_collector(collect_runtime_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Prometheus scrape endpoint"""
+    if not metrics.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if metrics.METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {metrics.METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 # ============================================
 # 🏠 BOOKING ROUTES
@@ -482,133 +629,346 @@ async def health_check(database = Depends(get_database_dependency)):
 
 @app.post("/api/bookings", response_model=dict)
 async def create_booking(booking: BookingCreate, current_user: dict = Depends(get_current_user), database = Depends(get_database_dependency)):
-    room = database.get_room_by_id(booking.room_id)
-    if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
-    if room["status"] != "available":
+    # Availability check, booking and notification are written in one transaction
+    try:
+        booking_id = await database.create_booking_request(
+            user_id=current_user["id"],
+            room_id=booking.room_id,
+            start_date=booking.start_date,
+            end_date=booking.end_date,
+            duration=booking.duration,
+            message=f"New booking request from {current_user['username']}"
+        )
+    except RoomUnavailableError:
         raise HTTPException(status_code=400, detail="Room is not available")
 
-    booking_id = database.create_booking(
-        user_id=current_user["id"],
-        room_id=booking.room_id,
-        start_date=booking.start_date,
-        end_date=booking.end_date,
-        duration=booking.duration
-    )
-
-    database.create_notification(
-        user_id=current_user["id"],
-        booking_id=booking_id,
-        message=f"New booking request from {current_user['username']}",
-        notification_type="booking_request"
-    )
+    if booking_id is None:
+        raise HTTPException(status_code=404, detail="Room not found")
 
     return {"id": booking_id, "message": "Booking created successfully"}
 
 
-@app.get("/api/bookings/my", response_model=List[dict])
-async def get_my_bookings(current_user: dict = Depends(get_current_user), database = Depends(get_database_dependency)):
-    return database.get_user_bookings(current_user["id"])
+@app.get("/api/bookings/my", response_model=List[BookingRow])
+async def get_my_bookings(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    database = Depends(get_database_dependency)
+):
+    """Newest first; with ?since=<watermark> ("" for everything), only rows changed after it.
+    Rows from the last FEED_SAFETY_LAG_SECONDS may repeat on the next poll; upsert them by id."""
+    bookings = await database.get_user_bookings(current_user["id"], limit=limit, cursor=cursor, since=since)
+    return rows_response(booking_list_adapter, bookings)
 
 
 @app.put("/api/bookings/{booking_id}", response_model=dict)
 async def update_booking(booking_id: str, booking: BookingUpdate, current_user: dict = Depends(get_current_user), database = Depends(get_database_dependency)):
-    existing_booking = database.get_booking_by_id(booking_id)
+    existing_booking = await database.get_booking_by_id(booking_id)
     if not existing_booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     if existing_booking["user_id"] != current_user["id"]:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    database.update_booking(booking_id, booking.dict(exclude_unset=True))
+    await database.update_booking(booking_id, booking.dict(exclude_unset=True))
     return {"message": "Booking updated successfully"}
 
 
 @app.delete("/api/bookings/{booking_id}")
 async def cancel_booking(booking_id: str, current_user: dict = Depends(get_current_user), database = Depends(get_database_dependency)):
-    existing_booking = database.get_booking_by_id(booking_id)
+    existing_booking = await database.get_booking_by_id(booking_id)
     if not existing_booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     if existing_booking["user_id"] != current_user["id"]:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    database.update_booking(booking_id, {"status": "cancelled"})
+    await database.update_booking(booking_id, {"status": "cancelled"})
     return {"message": "Booking cancelled successfully"}
 
 # ============================================
 # 🏡 ROOM ROUTES
 # ============================================
 
-@app.get("/api/rooms", response_model=List[dict])
-async def get_rooms(database = Depends(get_database_dependency)):
-    return database.get_all_rooms()
+def build_cached_body(body: bytes, next_cursor: Optional[str] = None):
+    """Tag a serialized response body with a strong ETag for caching"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"', body, next_cursor
+
+
+def cached_json_response(request: Request, entry) -> Response:
+    """Return the cached body, or 304 when the client already has this ETag"""
+    etag, body, next_cursor = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in client_tags or etag in client_tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/api/rooms", response_model=List[RoomRow])
+async def get_rooms(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    database = Depends(get_database_dependency)
+):
+    cache_key = ("all", limit, cursor)
+    entry = room_cache.get(cache_key)
+    if entry is None:
+        generation = room_cache.generation
+        rooms = await database.get_all_rooms(limit=limit, cursor=cursor)
+        with phase("encode"):
+            entry = build_cached_body(room_list_adapter.dump_json(rooms, exclude_none=True), rooms.next_cursor)
+        # An empty list may mean the query failed, so don't pin it in the cache
+        if rooms:
+            room_cache.set(cache_key, entry, generation=generation)
+    return cached_json_response(request, entry)
+
+
+@app.get("/api/rooms/available", response_model=List[RoomRow])
+async def get_available_rooms(
+    start: date,
+    end: date,
+    room_type: Optional[str] = None,
+    capacity: Optional[int] = Query(None, ge=1),
+    database = Depends(get_database_dependency)
+):
+    """Rooms free for the whole stay [start, end)"""
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    rooms = await database.find_available_rooms(start, end, room_type=room_type, capacity=capacity)
+    return rows_response(room_list_adapter, rooms)
 
 
 @app.get("/api/rooms/{room_id}", response_model=dict)
-async def get_room(room_id: str, database = Depends(get_database_dependency)):
-    room = database.get_room_by_id(room_id)
-    if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
-    return room
+async def get_room(room_id: str, request: Request, database = Depends(get_database_dependency)):
+    entry = room_cache.get(("room", room_id))
+    if entry is None:
+        generation = room_cache.generation
+        room = await database.get_room_by_id(room_id)
+        if not room:
+            raise HTTPException(status_code=404, detail="Room not found")
+        # Same row shape and timestamp format as the room lists
+        entry = build_cached_body(room_adapter.dump_json(RoomRow.from_node(room), exclude_none=True))
+        room_cache.set(("room", room_id), entry, generation=generation)
+    return cached_json_response(request, entry)
 
 
 @app.post("/api/rooms", response_model=dict)
 async def create_room(room: RoomCreate, current_user: dict = Depends(get_current_admin), database = Depends(get_database_dependency)):
-    room_id = database.create_room(**room.dict())
+    room_id = await database.create_room(**room.dict())
     return {"id": room_id, "message": "Room created successfully"}
 
 
 @app.put("/api/rooms/{room_id}", response_model=dict)
 async def update_room(room_id: str, room: RoomUpdate, current_user: dict = Depends(get_current_admin), database = Depends(get_database_dependency)):
-    database.update_room(room_id, room.dict(exclude_unset=True))
+    await database.update_room(room_id, room.dict(exclude_unset=True))
     return {"message": "Room updated successfully"}
 
 
 @app.delete("/api/rooms/{room_id}")
 async def delete_room(room_id: str, current_user: dict = Depends(get_current_admin), database = Depends(get_database_dependency)):
-    database.delete_room(room_id)
+    await database.delete_room(room_id)
     return {"message": "Room deleted successfully"}
 
 # ============================================
 # 👥 TENANT ROUTES (Admin only)
 # ============================================
 
-@app.get("/api/tenants", response_model=List[dict])
-async def get_tenants(current_user: dict = Depends(get_current_admin), database = Depends(get_database_dependency)):
-    return database.get_all_tenants()
+@app.get("/api/tenants", response_model=List[TenantRow])
+async def get_tenants(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_admin),
+    database = Depends(get_database_dependency)
+):
+    tenants = await database.get_all_tenants(limit=limit, cursor=cursor)
+    return rows_response(tenant_list_adapter, tenants)
 
 
 @app.post("/api/tenants", response_model=dict)
 async def create_tenant(tenant: TenantCreate, current_user: dict = Depends(get_current_admin), database = Depends(get_database_dependency)):
-    tenant_id = database.create_tenant(**tenant.dict())
+    tenant_id = await database.create_tenant(**tenant.dict())
     return {"id": tenant_id, "message": "Tenant created successfully"}
 
+# ============================================
+# 📥 BULK IMPORT ROUTES (Admin only)
+# ============================================
+
+@app.post("/api/admin/import/{kind}", response_model=ImportResult)
+async def bulk_import(
+    kind: Literal["rooms", "users", "tenants"],
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_admin),
+    database = Depends(get_database_dependency)
+):
+    """Import rooms, users or tenants from a CSV or JSONL upload, one transaction per chunk"""
+    try:
+        fmt = import_format(file.filename, file.content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    bulk_create = getattr(database, f"bulk_create_{kind}")
+    report = ImportReport()
+    chunk = []
+    async for row in aiter_upload_rows(kind, file, fmt, report):
+        chunk.append(row)
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            report.add_result(await bulk_create(chunk))
+            chunk = []
+    if chunk:
+        report.add_result(await bulk_create(chunk))
+
+    result = report.as_dict()
+    logger.info(
+        f"📥 Imported {kind}: {result['created']} created, {result['skipped']} skipped, "
+        f"{result['invalid']} invalid ({result['rows_per_second']} rows/sec)"
+    )
+    return result
+
+# ============================================
+# 📤 EXPORT ROUTES (Admin only)
+# ============================================
+
+# Rows encoded per chunk sent to the client
+EXPORT_FLUSH_ROWS = 500
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+def encode_export_rows(rows: List[Dict], columns: List[str], fmt: str) -> bytes:
+    if fmt == "ndjson":
+        return b"".join(dump_json(row) + b"\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(row[column]) for column in columns] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+async def export_stream(first: Optional[Dict], rows: AsyncIterator[Dict], columns: List[str], fmt: str):
+    """Encode rows in chunks of EXPORT_FLUSH_ROWS so memory stays flat however long the export"""
+    if fmt == "csv":
+        yield encode_export_rows([dict(zip(columns, columns))], columns, fmt)
+    batch = [] if first is None else [first]
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= EXPORT_FLUSH_ROWS:
+            yield encode_export_rows(batch, columns, fmt)
+            batch = []
+    if batch:
+        yield encode_export_rows(batch, columns, fmt)
+
+
+@app.get("/api/admin/export/{kind}")
+async def export_rows(
+    kind: Literal["bookings", "tenants", "notifications"],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: dict = Depends(get_current_admin),
+    database = Depends(get_database_dependency)
+):
+    """Stream every booking, tenant or notification as NDJSON or CSV"""
+    columns, _ = EXPORTS[kind]
+    rows = database.stream_export(kind)
+    # Start the query before committing to a 200 so connection errors still surface
+    try:
+        first = await anext(rows, None)
+    except Exception as e:
+        logger.error(f"❌ Export of {kind} failed: {e}")
+        await rows.aclose()
+        raise HTTPException(status_code=503, detail="Database temporarily unavailable. Please try again later.")
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    return StreamingResponse(
+        export_stream(first, rows, columns, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'}
+    )
+
 # ============================================
 # 🔔 NOTIFICATION ROUTES
 # ============================================
 
-@app.get("/api/notifications", response_model=List[dict])
-async def get_notifications(current_user: dict = Depends(get_current_user), database = Depends(get_database_dependency)):
+@app.get("/api/notifications", response_model=List[NotificationRow])
+async def get_notifications(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    database = Depends(get_database_dependency)
+):
+    """Newest first; with ?since=<watermark> ("" for everything), only rows changed after it.
+    Rows from the last FEED_SAFETY_LAG_SECONDS may repeat on the next poll; upsert them by id."""
     if current_user["role"] == "admin":
-        return database.get_all_notifications()
-    return database.get_user_notifications(current_user["id"])
+        notifications = await database.get_all_notifications(limit=limit, cursor=cursor, since=since)
+    else:
+        notifications = await database.get_user_notifications(current_user["id"], limit=limit,
+                                                              cursor=cursor, since=since)
+    return rows_response(notification_list_adapter, notifications)
 
 
 @app.put("/api/notifications/{notification_id}", response_model=dict)
 async def update_notification(notification_id: str, notification: NotificationUpdate, current_user: dict = Depends(get_current_admin), database = Depends(get_database_dependency)):
-    database.update_notification(notification_id, notification.dict(exclude_unset=True))
-
-    if notification.status in ["approved", "rejected"]:
-        notif = database.get_notification_by_id(notification_id)
-        if notif and notif.get("booking_id"):
-            database.update_booking(notif["booking_id"], {"status": notification.status})
+    # Approval/rejection cascades to the booking (and room) in a single transaction
+    resolved = None
+    if notification.status == "approved":
+        resolved = await database.approve_booking(notification_id)
+    elif notification.status == "rejected":
+        resolved = await database.reject_booking(notification_id)
 
-            if notification.status == "approved":
-                booking = database.get_booking_by_id(notif["booking_id"])
-                if booking and booking.get("room"):
-                    database.update_room(booking["room"]["id"], {"status": "occupied"})
+    if resolved is None:
+        await database.update_notification(notification_id, notification.dict(exclude_unset=True))
 
     return {"message": "Notification updated successfully"}
 
+# ============================================
+# 📡 EVENT STREAM (Server-Sent Events)
+# ============================================
+
+# Seconds between keep-alive comments; also bounds how late a disconnect is noticed
+EVENT_KEEPALIVE_SECONDS = float(os.getenv("EVENT_KEEPALIVE_SECONDS", "15"))
+
+async def get_event_user(request: Request, ticket: Optional[str] = None):
+    """EventSource cannot send headers, so browsers pass a ticket from
+    POST /api/events/ticket as ?ticket=. The access token itself is never taken
+    from the URL, where proxies and access logs would record it."""
+    if ticket is not None:
+        return await get_event_ticket_user(ticket)
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not credentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await get_current_user(credentials)
+
+def format_sse(event: Dict) -> bytes:
+    return b"event: " + event["type"].encode("utf-8") + b"\ndata: " + dump_json(event) + b"\n\n"
+
+async def event_stream(request: Request, user: dict):
+    async with get_broker().subscribe(user["id"], is_admin=user["role"] == "admin") as subscription:
+        # Clients refetch once on "ready" (and on "resync"), then apply pushed events
+        yield b"retry: 5000\n\n" + format_sse({"type": "ready"})
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=EVENT_KEEPALIVE_SECONDS)
+            yield b": keep-alive\n\n" if event is None else format_sse(event)
+
+
+@app.post("/api/events/ticket")
+async def create_events_ticket(current_user: dict = Depends(get_current_user)):
+    """Ticket for opening /api/events?ticket=... from an EventSource"""
+    return {"ticket": create_event_ticket(current_user["email"]), "expires_in": EVENT_TICKET_EXPIRE_SECONDS}
+
+@app.get("/api/events")
+async def stream_events(request: Request, current_user: dict = Depends(get_event_user)):
+    """Push notification and booking status events for the current user (admins get all)"""
+    return StreamingResponse(
+        event_stream(request, current_user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ============================================
 # 🌐 STATIC FILE SERVING (SPA Support)
 # ============================================
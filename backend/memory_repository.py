@@ -0,0 +1,563 @@
+"""
+In-process storage engine implementing Repository (STORAGE_BACKEND=memory).
+
+Records live in dicts keyed by id, with secondary indexes by email, room,
+user, booking and status, plus bisect-ordered (sort value, id) indexes. Those
+give keyset pages and ?since= change feeds in O(log n + page) without
+scanning. Writes run under one lock, so a booking request's availability check
+and insert are atomic just as in the Neo4j transaction. Data is lost on restart.
+It is meant for local development, load tests, and as a zero-latency baseline
+for measuring Neo4j's own cost.
+"""
+from collections import defaultdict
+from datetime import datetime, date, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import bisect
+import logging
+import threading
+import uuid
+
+from cache import user_cache, room_cache
+from events import publish_event
+from repository import Repository
+from database import (
+    Page, RoomRow, UserSummaryRow, BookingRow, TenantRow, NotificationRow,
+    InvalidCursorError, RoomUnavailableError, BULK_CHUNK_SIZE,
+    ROOM_UPDATE_FIELDS, BOOKING_UPDATE_FIELDS, NOTIFICATION_UPDATE_FIELDS,
+    decode_cursor, _build_page, _update_props, _dedupe, _bulk_result,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bookings in these states hold their room for the booked dates
+ACTIVE_BOOKING_STATUSES = ("pending", "approved")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_date(value) -> date:
+    return date.fromisoformat(value[:10]) if isinstance(value, str) else value
+
+
+def _cursor_value(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+class SortedIndex:
+    """(sort value, id) keys kept in order with bisect, sliced for keyset pages"""
+
+    def __init__(self):
+        self._keys: List[Tuple] = []
+
+    def add(self, value, item_id: str):
+        bisect.insort(self._keys, (value, item_id))
+
+    def remove(self, value, item_id: str):
+        i = bisect.bisect_left(self._keys, (value, item_id))
+        if i < len(self._keys) and self._keys[i] == (value, item_id):
+            del self._keys[i]
+
+    def page(self, after: Optional[Tuple], descending: bool, count: Optional[int]) -> List[Tuple]:
+        """Up to ``count`` keys strictly after ``after`` in the given direction"""
+        if descending:
+            end = len(self._keys) if after is None else bisect.bisect_left(self._keys, after)
+            start = 0 if count is None else max(0, end - count)
+            return self._keys[start:end][::-1]
+        start = 0 if after is None else bisect.bisect_right(self._keys, after)
+        return self._keys[start:] if count is None else self._keys[start:start + count]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class InMemoryRepository(Repository):
+    """Indexed dict-backed Repository; see the module docstring"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._connected = False
+
+        self.users: Dict[str, Dict] = {}
+        self.rooms: Dict[str, Dict] = {}
+        self.bookings: Dict[str, Dict] = {}
+        self.tenants: Dict[str, Dict] = {}
+        self.notifications: Dict[str, Dict] = {}
+
+        self._user_by_email: Dict[str, str] = {}
+        self._rooms_by_number = defaultdict(set)
+        self._rooms_ordered = SortedIndex()                 # (room_number, id)
+        self._bookings_by_room = defaultdict(set)
+        self._bookings_by_status = defaultdict(set)
+        self._bookings_by_user = defaultdict(SortedIndex)   # (created_at, id)
+        self._bookings_by_user_updated = defaultdict(SortedIndex)
+        self._tenant_by_email: Dict[str, str] = {}
+        self._tenants_by_room = defaultdict(set)
+        self._tenants_ordered = SortedIndex()               # (name, id)
+        self._notifications_ordered = SortedIndex()         # (created_at, id)
+        self._notifications_updated = SortedIndex()
+        self._notifications_by_user = defaultdict(SortedIndex)
+        self._notifications_by_user_updated = defaultdict(SortedIndex)
+        self._notifications_by_status = defaultdict(set)
+
+    # ---- Lifecycle ----
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def connect(self):
+        self._connected = True
+        logger.info("In-memory storage backend ready")
+
+    async def close(self):
+        self._connected = False
+
+    # ---- Keyset helpers ----
+
+    @staticmethod
+    def _after(cursor: Optional[str], temporal: bool) -> Optional[Tuple]:
+        after_key, after_id = decode_cursor(cursor)
+        if after_id is None:
+            return None
+        if temporal:
+            try:
+                after_key = datetime.fromisoformat(after_key)
+            except (TypeError, ValueError):
+                raise InvalidCursorError("Invalid pagination cursor")
+        return after_key, after_id
+
+    def _page(self, index: SortedIndex, records: Dict[str, Dict], make_row, limit: Optional[int],
+              cursor: Optional[str], since: Optional[str] = None, temporal: bool = True) -> Page:
+        """Newest-first page of ``index``, or ascending from the watermark when ``since`` is given"""
+        descending = since is None
+        after = self._after(cursor if since is None else since, temporal)
+        keys = index.page(after, descending, limit + 1 if limit else None)
+        entries = [(make_row(records[item_id]), _cursor_value(value), item_id) for value, item_id in keys]
+        return _build_page(entries, limit, since)
+
+    def _room_row(self, room_id: Optional[str]) -> Optional[RoomRow]:
+        room = self.rooms.get(room_id)
+        return RoomRow.from_node(room) if room else None
+
+    @staticmethod
+    def _props(record: Dict, *relations: str) -> Dict:
+        return {key: value for key, value in record.items() if key not in relations}
+
+    # ---- Users ----
+
+    async def create_user(self, email: str, username: str, password: str, role: str = "user") -> str:
+        from auth import get_password_hash_async
+        hashed_password = await get_password_hash_async(password)
+        with self._lock:
+            if email in self._user_by_email:
+                raise Exception("User with this email already exists")
+            user_id = str(uuid.uuid4())
+            self._insert_user({"id": user_id, "email": email, "username": username,
+                               "password": hashed_password, "role": role, "created_at": _now()})
+        user_cache.invalidate(email)
+        return user_id
+
+    def _insert_user(self, user: Dict):
+        self.users[user["id"]] = user
+        self._user_by_email[user["email"]] = user["id"]
+
+    async def get_user_by_email(self, email: str) -> Optional[Dict]:
+        user_id = self._user_by_email.get(email)
+        return dict(self.users[user_id]) if user_id else None
+
+    async def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        user = self.users.get(user_id)
+        return dict(user) if user else None
+
+    # ---- Rooms ----
+
+    async def create_room(self, room_number: str, room_type: str, capacity: int,
+                          price: float, status: str = "available") -> str:
+        room_id = str(uuid.uuid4())
+        with self._lock:
+            self._insert_room({"id": room_id, "room_number": room_number, "room_type": room_type,
+                               "capacity": capacity, "price": price, "status": status,
+                               "created_at": _now()})
+        room_cache.clear()
+        return room_id
+
+    def _insert_room(self, room: Dict):
+        self.rooms[room["id"]] = room
+        self._rooms_by_number[room["room_number"]].add(room["id"])
+        self._rooms_ordered.add(room["room_number"], room["id"])
+
+    async def get_all_rooms(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> Page:
+        after = self._after(cursor, temporal=False)
+        keys = self._rooms_ordered.page(after, False, limit + 1 if limit else None)
+        entries = [(RoomRow.from_node(self.rooms[room_id]), number, room_id) for number, room_id in keys]
+        return _build_page(entries, limit)
+
+    async def get_room_by_id(self, room_id: str) -> Optional[Dict]:
+        room = self.rooms.get(room_id)
+        return dict(room) if room else None
+
+    def _is_free(self, room_id: str, start: date, end: date) -> bool:
+        return not any(
+            booking["status"] in ACTIVE_BOOKING_STATUSES
+            and booking["start_date"] < end and start < booking["end_date"]
+            for booking in map(self.bookings.get, self._bookings_by_room[room_id])
+        )
+
+    async def find_available_rooms(self, start: date, end: date, room_type: Optional[str] = None,
+                                   capacity: Optional[int] = None) -> List[RoomRow]:
+        busy = {
+            self.bookings[booking_id]["room_id"]
+            for status in ACTIVE_BOOKING_STATUSES
+            for booking_id in self._bookings_by_status[status]
+            if self.bookings[booking_id]["start_date"] < end and start < self.bookings[booking_id]["end_date"]
+        }
+        rooms = []
+        for _, room_id in self._rooms_ordered.page(None, False, None):
+            room = self.rooms[room_id]
+            if (room_id not in busy and room["status"] != "maintenance"
+                    and (room_type is None or room["room_type"] == room_type)
+                    and (capacity is None or room["capacity"] >= capacity)):
+                rooms.append(RoomRow.from_node(room))
+        return rooms
+
+    async def update_room(self, room_id: str, updates: Dict):
+        props = _update_props(updates, ROOM_UPDATE_FIELDS)
+        if not props:
+            return
+        with self._lock:
+            room = self.rooms.get(room_id)
+            if room is None:
+                return
+            if "room_number" in props:
+                self._rooms_by_number[room["room_number"]].discard(room_id)
+                self._rooms_ordered.remove(room["room_number"], room_id)
+                self._rooms_by_number[props["room_number"]].add(room_id)
+                self._rooms_ordered.add(props["room_number"], room_id)
+            room.update(props, updated_at=_now())
+        room_cache.clear()
+
+    async def delete_room(self, room_id: str):
+        with self._lock:
+            room = self.rooms.pop(room_id, None)
+            if room is None:
+                return
+            self._rooms_by_number[room["room_number"]].discard(room_id)
+            self._rooms_ordered.remove(room["room_number"], room_id)
+            # Like DETACH DELETE: bookings and tenants survive but lose their room
+            for booking_id in self._bookings_by_room.pop(room_id, set()):
+                booking = self.bookings[booking_id]
+                booking["room_id"] = None
+                self._bookings_by_user[booking["user_id"]].remove(booking["created_at"], booking_id)
+                self._bookings_by_user_updated[booking["user_id"]].remove(booking["updated_at"], booking_id)
+            for tenant_id in self._tenants_by_room.pop(room_id, set()):
+                tenant = self.tenants[tenant_id]
+                tenant["room_id"] = None
+                self._tenants_ordered.remove(tenant["name"], tenant_id)
+        room_cache.clear()
+
+    # ---- Bookings ----
+
+    def _insert_booking(self, booking: Dict):
+        booking_id, user_id = booking["id"], booking["user_id"]
+        self.bookings[booking_id] = booking
+        self._bookings_by_room[booking["room_id"]].add(booking_id)
+        self._bookings_by_status[booking["status"]].add(booking_id)
+        self._bookings_by_user[user_id].add(booking["created_at"], booking_id)
+        self._bookings_by_user_updated[user_id].add(booking["updated_at"], booking_id)
+
+    def _touch_booking(self, booking: Dict, props: Dict):
+        """Apply changes to a booking, keeping the status and updated_at indexes in step"""
+        booking_id, user_id = booking["id"], booking["user_id"]
+        if "status" in props:
+            self._bookings_by_status[booking["status"]].discard(booking_id)
+            self._bookings_by_status[props["status"]].add(booking_id)
+        linked = booking["room_id"] is not None
+        if linked:
+            self._bookings_by_user_updated[user_id].remove(booking["updated_at"], booking_id)
+        booking.update(props, updated_at=_now())
+        if linked:
+            self._bookings_by_user_updated[user_id].add(booking["updated_at"], booking_id)
+
+    def _new_booking(self, user_id: str, room_id: str, start_date, end_date, duration: int) -> Dict:
+        now = _now()
+        return {"id": str(uuid.uuid4()), "start_date": _as_date(start_date), "end_date": _as_date(end_date),
+                "duration": duration, "status": "pending", "created_at": now, "updated_at": now,
+                "user_id": user_id, "room_id": room_id}
+
+    async def create_booking(self, user_id: str, room_id: str, start_date: str,
+                             end_date: str, duration: int) -> str:
+        with self._lock:
+            if user_id not in self.users or room_id not in self.rooms:
+                raise Exception("Database connection unavailable. Please try again later.")
+            booking = self._new_booking(user_id, room_id, start_date, end_date, duration)
+            self._insert_booking(booking)
+        return booking["id"]
+
+    async def create_booking_request(self, user_id: str, room_id: str, start_date: date,
+                                     end_date: date, duration: int, message: str) -> Optional[str]:
+        with self._lock:
+            room = self.rooms.get(room_id)
+            if room is None or user_id not in self.users:
+                return None
+            if room["status"] == "maintenance" or not self._is_free(room_id, start_date, end_date):
+                raise RoomUnavailableError("Room is not available")
+            booking = self._new_booking(user_id, room_id, start_date, end_date, duration)
+            self._insert_booking(booking)
+            notification = self._new_notification(user_id, booking["id"], message, "booking_request")
+            self._insert_notification(notification)
+        await publish_event("notification.created", user_id, notification_id=notification["id"],
+                            booking_id=booking["id"], notification_type="booking_request", status="pending")
+        return booking["id"]
+
+    async def get_user_bookings(self, user_id: str, limit: Optional[int] = None,
+                                cursor: Optional[str] = None, since: Optional[str] = None) -> Page:
+        index = (self._bookings_by_user if since is None else self._bookings_by_user_updated).get(user_id)
+        if index is None:
+            index = SortedIndex()
+        return self._page(index, self.bookings,
+                          lambda b: BookingRow.from_node(b, room=self._room_row(b["room_id"])),
+                          limit, cursor, since)
+
+    async def get_booking_by_id(self, booking_id: str) -> Optional[Dict]:
+        booking = self.bookings.get(booking_id)
+        if booking is None or booking["room_id"] is None:
+            return None
+        result = self._props(booking, "user_id", "room_id")
+        result["room"] = dict(self.rooms[booking["room_id"]])
+        result["user_id"] = booking["user_id"]
+        return result
+
+    async def update_booking(self, booking_id: str, updates: Dict):
+        props = _update_props(updates, BOOKING_UPDATE_FIELDS)
+        if not props:
+            return
+        with self._lock:
+            booking = self.bookings.get(booking_id)
+            if booking is None:
+                return
+            self._touch_booking(booking, props)
+        await publish_event("booking.updated", booking["user_id"], booking_id=booking_id,
+                            status=booking["status"], fields=sorted(props))
+
+    # ---- Tenants ----
+
+    def _insert_tenant(self, tenant: Dict):
+        self.tenants[tenant["id"]] = tenant
+        self._tenant_by_email[tenant["email"]] = tenant["id"]
+        self._tenants_by_room[tenant["room_id"]].add(tenant["id"])
+        self._tenants_ordered.add(tenant["name"], tenant["id"])
+
+    async def create_tenant(self, name: str, email: str, phone: str, room_id: str) -> str:
+        with self._lock:
+            if room_id not in self.rooms:
+                raise Exception("Database connection unavailable. Please try again later.")
+            tenant_id = str(uuid.uuid4())
+            self._insert_tenant({"id": tenant_id, "name": name, "email": email, "phone": phone,
+                                 "created_at": _now(), "room_id": room_id})
+        return tenant_id
+
+    async def get_all_tenants(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> Page:
+        after = self._after(cursor, temporal=False)
+        keys = self._tenants_ordered.page(after, False, limit + 1 if limit else None)
+        entries = []
+        for name, tenant_id in keys:
+            tenant = self.tenants[tenant_id]
+            row = TenantRow.from_node(tenant, room=self._room_row(tenant["room_id"]))
+            entries.append((row, name, tenant_id))
+        return _build_page(entries, limit)
+
+    # ---- Notifications ----
+
+    def _new_notification(self, user_id: str, booking_id: str, message: str, notification_type: str) -> Dict:
+        now = _now()
+        return {"id": str(uuid.uuid4()), "message": message, "type": notification_type,
+                "status": "pending", "created_at": now, "updated_at": now,
+                "user_id": user_id, "booking_id": booking_id}
+
+    def _insert_notification(self, notification: Dict):
+        notification_id, user_id = notification["id"], notification["user_id"]
+        self.notifications[notification_id] = notification
+        self._notifications_ordered.add(notification["created_at"], notification_id)
+        self._notifications_updated.add(notification["updated_at"], notification_id)
+        self._notifications_by_user[user_id].add(notification["created_at"], notification_id)
+        self._notifications_by_user_updated[user_id].add(notification["updated_at"], notification_id)
+        self._notifications_by_status[notification["status"]].add(notification_id)
+
+    def _touch_notification(self, notification: Dict, props: Dict):
+        notification_id, user_id = notification["id"], notification["user_id"]
+        if "status" in props:
+            self._notifications_by_status[notification["status"]].discard(notification_id)
+            self._notifications_by_status[props["status"]].add(notification_id)
+        self._notifications_updated.remove(notification["updated_at"], notification_id)
+        self._notifications_by_user_updated[user_id].remove(notification["updated_at"], notification_id)
+        notification.update(props, updated_at=_now())
+        self._notifications_updated.add(notification["updated_at"], notification_id)
+        self._notifications_by_user_updated[user_id].add(notification["updated_at"], notification_id)
+
+    async def create_notification(self, user_id: str, booking_id: str,
+                                  message: str, notification_type: str) -> str:
+        with self._lock:
+            if user_id not in self.users or booking_id not in self.bookings:
+                raise Exception("Database connection unavailable. Please try again later.")
+            notification = self._new_notification(user_id, booking_id, message, notification_type)
+            self._insert_notification(notification)
+        await publish_event("notification.created", user_id, notification_id=notification["id"],
+                            booking_id=booking_id, notification_type=notification_type, status="pending")
+        return notification["id"]
+
+    def _notification_row(self, notification: Dict, with_user: bool) -> NotificationRow:
+        user = self.users.get(notification["user_id"]) if with_user else None
+        return NotificationRow.from_node(notification, booking_id=notification["booking_id"],
+                                         user=UserSummaryRow.from_node(user) if user else None)
+
+    async def get_all_notifications(self, limit: Optional[int] = None, cursor: Optional[str] = None,
+                                    since: Optional[str] = None) -> Page:
+        index = self._notifications_ordered if since is None else self._notifications_updated
+        return self._page(index, self.notifications, lambda n: self._notification_row(n, True),
+                          limit, cursor, since)
+
+    async def get_user_notifications(self, user_id: str, limit: Optional[int] = None,
+                                     cursor: Optional[str] = None, since: Optional[str] = None) -> Page:
+        indexes = self._notifications_by_user if since is None else self._notifications_by_user_updated
+        index = indexes.get(user_id) or SortedIndex()
+        return self._page(index, self.notifications, lambda n: self._notification_row(n, False),
+                          limit, cursor, since)
+
+    async def get_notification_by_id(self, notification_id: str) -> Optional[Dict]:
+        notification = self.notifications.get(notification_id)
+        if notification is None:
+            return None
+        result = self._props(notification, "user_id", "booking_id")
+        if notification["booking_id"]:
+            result["booking_id"] = notification["booking_id"]
+        return result
+
+    async def update_notification(self, notification_id: str, updates: Dict):
+        props = _update_props(updates, NOTIFICATION_UPDATE_FIELDS)
+        if not props:
+            return
+        with self._lock:
+            notification = self.notifications.get(notification_id)
+            if notification is None:
+                return
+            self._touch_notification(notification, props)
+        await publish_event("notification.updated", notification["user_id"],
+                            notification_id=notification_id, status=notification["status"])
+
+    async def approve_booking(self, notification_id: str) -> Optional[Dict]:
+        return await self._resolve_booking(notification_id, "approved")
+
+    async def reject_booking(self, notification_id: str) -> Optional[Dict]:
+        return await self._resolve_booking(notification_id, "rejected")
+
+    async def _resolve_booking(self, notification_id: str, status: str) -> Optional[Dict]:
+        with self._lock:
+            notification = self.notifications.get(notification_id)
+            booking = self.bookings.get(notification["booking_id"]) if notification else None
+            room = self.rooms.get(booking["room_id"]) if booking else None
+            if room is None:
+                return None
+            self._touch_notification(notification, {"status": status})
+            self._touch_booking(booking, {"status": status})
+            if status == "approved":
+                room.update(status="occupied", updated_at=_now())
+            resolved = {"booking": {**self._props(booking, "user_id", "room_id"), "user_id": booking["user_id"]},
+                        "room": dict(room)}
+        if status == "approved":
+            room_cache.clear()
+        await publish_event(f"booking.{status}", booking["user_id"], booking_id=booking["id"],
+                            notification_id=notification_id, room_id=room["id"], status=status)
+        return resolved
+
+    # ---- Bulk import ----
+
+    async def bulk_create_rooms(self, rows: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+        started = _now()
+        created = 0
+        with self._lock:
+            for row in _dedupe(rows, "room_number"):
+                if not self._rooms_by_number.get(row["room_number"]):
+                    self._insert_room({"status": "available", **row, "id": str(uuid.uuid4()),
+                                       "created_at": _now()})
+                    created += 1
+        room_cache.clear()
+        return _bulk_result(len(rows), created, (_now() - started).total_seconds())
+
+    async def bulk_create_users(self, rows: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+        from auth import hash_passwords_async
+        started = _now()
+        new_rows = [row for row in _dedupe(rows, "email") if row["email"] not in self._user_by_email]
+        hashes = await hash_passwords_async([row["password"] for row in new_rows])
+        created = 0
+        with self._lock:
+            for row, hashed in zip(new_rows, hashes):
+                if row["email"] not in self._user_by_email:
+                    self._insert_user({"role": "user", **row, "password": hashed,
+                                       "id": str(uuid.uuid4()), "created_at": _now()})
+                    created += 1
+        return _bulk_result(len(rows), created, (_now() - started).total_seconds())
+
+    async def bulk_create_tenants(self, rows: List[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+        started = _now()
+        created = 0
+        with self._lock:
+            for row in _dedupe(rows, "email"):
+                room_id = row.get("room_id")
+                if room_id not in self.rooms:
+                    by_number = sorted(self._rooms_by_number.get(row.get("room_number"), ()))
+                    room_id = by_number[0] if by_number else None
+                if room_id is None or row["email"] in self._tenant_by_email:
+                    continue
+                self._insert_tenant({"id": str(uuid.uuid4()), "name": row["name"], "email": row["email"],
+                                     "phone": row["phone"], "created_at": _now(), "room_id": room_id})
+                created += 1
+        return _bulk_result(len(rows), created, (_now() - started).total_seconds())
+
+    # ---- Streaming export ----
+
+    def _export_rows(self, kind: str) -> List[Dict]:
+        if kind == "bookings":
+            rows = []
+            for booking in sorted(self.bookings.values(), key=lambda b: b["created_at"]):
+                user = self.users.get(booking["user_id"]) or {}
+                room = self.rooms.get(booking["room_id"]) or {}
+                rows.append({
+                    "id": booking["id"], "status": booking["status"],
+                    "start_date": booking["start_date"], "end_date": booking["end_date"],
+                    "duration": booking["duration"], "created_at": booking["created_at"],
+                    "user_id": user.get("id"), "user_email": user.get("email"),
+                    "room_id": room.get("id"), "room_number": room.get("room_number"),
+                })
+            return rows
+        if kind == "tenants":
+            rows = []
+            for tenant in sorted(self.tenants.values(), key=lambda t: t["name"]):
+                room = self.rooms.get(tenant["room_id"]) or {}
+                rows.append({
+                    "id": tenant["id"], "name": tenant["name"], "email": tenant["email"],
+                    "phone": tenant["phone"], "created_at": tenant["created_at"],
+                    "room_id": room.get("id"), "room_number": room.get("room_number"),
+                })
+            return rows
+        rows = []
+        for _, notification_id in self._notifications_ordered.page(None, False, None):
+            notification = self.notifications[notification_id]
+            user = self.users.get(notification["user_id"]) or {}
+            rows.append({
+                "id": notification_id, "type": notification["type"], "status": notification["status"],
+                "message": notification["message"], "created_at": notification["created_at"],
+                "user_id": user.get("id"), "user_email": user.get("email"),
+                "booking_id": notification["booking_id"],
+            })
+        return rows
+
+    async def stream_export(self, kind: str) -> AsyncIterator[Dict]:
+        with self._lock:
+            rows = self._export_rows(kind)
+        for i, row in enumerate(rows, 1):
+            yield row
+            if i % 1000 == 0:
+                await asyncio.sleep(0)
@@ -0,0 +1,220 @@
+"""
+Prometheus text-format metrics, served by GET /metrics.
+
+Counters and histograms are plain dicts keyed by label values. They are
+updated from the event loop thread without locks, so recording a sample
+costs a dict lookup and a few additions. Values owned by other modules are
+read only when /metrics is scraped, through collectors registered with
+register_collector(). These include the bcrypt pool, caches, the event
+broker and the driver connection pool.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import logging
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Off by default: the series describe routes, pool and database internals
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes", "on")
+# When set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached read (sub-ms) up to an Aura round trip under retry
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (name, type, help, [(labels, value), ...])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label-value tuple"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for labels, value in list(self._values.items()):
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Gauge(Counter):
+    """Value that can go up and down (e.g. requests in flight)"""
+
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram:
+    """Bucketed observations per label-value tuple: [bucket counts..., sum, count]"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values: Dict[Tuple, List[float]] = {}
+
+    def observe(self, value: float, *labels):
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        # Count only the first bucket that fits; rendering makes them cumulative
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-2] += value
+        entry[-1] += 1
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for labels, entry in list(self._values.items()):
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), entry):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", base, entry[-2]
+            yield f"{self.name}_count", base, entry[-1]
+
+
+_metrics: List = []
+_collectors: List[Callable[[], Iterable[Family]]] = []
+
+
+def _register(metric):
+    _metrics.append(metric)
+    return metric
+
+
+def register_collector(collector: Callable[[], Iterable[Family]]):
+    """Add a function called at scrape time that returns metric families"""
+    _collectors.append(collector)
+
+
+def render() -> bytes:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}"
+                     for name, labels, value in metric.samples())
+    for collector in _collectors:
+        try:
+            families = list(collector())
+        except Exception as e:
+            logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+            continue
+        for name, kind, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}"
+                         for labels, value in samples if value is not None)
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# ---- HTTP ----
+
+HTTP_REQUEST_SECONDS = _register(Histogram(
+    "http_request_duration_seconds", "Time to the end of the response body, by route template",
+    ("method", "route", "status"),
+))
+HTTP_IN_FLIGHT = _register(Gauge(
+    "http_requests_in_flight", "Requests being handled (includes open event streams)",
+))
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # The router stores the matched route in the scope; raw paths would explode cardinality
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(perf_counter() - started, scope["method"],
+                                         getattr(route, "path", "unmatched"), str(status_code))
+
+
+# ---- Database ----
+
+DB_QUERY_SECONDS = _register(Histogram(
+    "db_query_duration_seconds", "Database method latency including retries", ("method",),
+))
+DB_RETRIES = _register(Counter(
+    "db_retries_total", "Connection errors retried by _execute_with_retry", ("method",),
+))
+DB_ERRORS = _register(Counter(
+    "db_errors_total", "Database methods that failed after any retries", ("method",),
+))
+DB_ACQUIRE_SECONDS = _register(Histogram(
+    "db_connection_acquire_seconds",
+    "Time from starting a managed transaction until its work runs (pool wait plus BEGIN)",
+    ("access_mode",),
+))
+
+
+@contextmanager
+def observe_db_method(method: str):
+    """Latency and failures of one public database method (as named by its caller)"""
+    started = perf_counter()
+    try:
+        yield
+    except Exception:
+        DB_ERRORS.inc(method)
+        raise
+    finally:
+        DB_QUERY_SECONDS.observe(perf_counter() - started, method)
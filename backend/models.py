@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, Literal
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, EmailStr, model_validator
+from typing import Optional, List, Literal
+from datetime import datetime, date
 
 # User models
 class UserBase(BaseModel):
@@ -49,16 +49,24 @@ class Room(RoomBase):
 # Booking models
 class BookingBase(BaseModel):
     room_id: str
-    start_date: str
-    end_date: str
+    start_date: date
+    end_date: date
     duration: int
 
+    @model_validator(mode="after")
+    def check_date_range(self):
+        if self.end_date <= self.start_date:
+            raise ValueError("end_date must be after start_date")
+        return self
+
 class BookingCreate(BookingBase):
     pass
 
 class BookingUpdate(BaseModel):
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    # Dates are fixed once booked: moving them would bypass the overlap check in
+    # create_booking_request, so clients cancel and re-book instead
+    model_config = ConfigDict(extra="forbid")
+
     duration: Optional[int] = None
     status: Optional[Literal["pending", "approved", "rejected", "cancelled"]] = None
 
@@ -81,6 +89,29 @@ class Tenant(TenantBase):
     id: str
     created_at: datetime
 
+class TenantImport(BaseModel):
+    """Bulk import row; the room is given by id or by room number"""
+    name: str
+    email: EmailStr
+    phone: str
+    room_id: Optional[str] = None
+    room_number: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_room(self):
+        if not self.room_id and not self.room_number:
+            raise ValueError("room_id or room_number is required")
+        return self
+
+class ImportResult(BaseModel):
+    submitted: int
+    created: int
+    skipped: int
+    invalid: int
+    seconds: float
+    rows_per_second: float
+    errors: List[str] = []
+
 # Notification models
 class NotificationBase(BaseModel):
     message: str
@@ -0,0 +1,161 @@
+"""
+Storage interface used by the API and authentication.
+
+AsyncNeo4jConnection (database.py) is the production implementation and
+InMemoryRepository (memory_repository.py) is an indexed in-process engine for
+local development and load tests. STORAGE_BACKEND picks one at startup (see
+database.get_shared_connection). List methods return Page objects of the typed
+rows defined in database.py; single-item getters return plain dicts.
+"""
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional
+
+
+class Repository(ABC):
+    """Async storage operations behind the API routes"""
+
+    # ---- Lifecycle (no-ops unless the backend needs them) ----
+
+    @property
+    @abstractmethod
+    def connected(self) -> bool:
+        """True once connect() has set the backend up"""
+
+    def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def verify_connectivity(self):
+        """Raise if the backend cannot be reached"""
+
+    async def ping(self) -> bool:
+        return True
+
+    def pool_stats(self) -> Optional[Dict[str, int]]:
+        """Connection pool usage (max_size, open, in_use, opening), if the backend has a pool"""
+        return None
+
+    async def create_constraints(self):
+        pass
+
+    async def index_report(self) -> Optional[Dict[str, List[str]]]:
+        return None
+
+    async def migrate_booking_dates(self) -> int:
+        return 0
+
+    async def backfill_updated_at(self) -> int:
+        return 0
+
+    # ---- Users ----
+
+    @abstractmethod
+    async def create_user(self, email: str, username: str, password: str, role: str = "user") -> str:
+        """Hash the password and create the user; raises if the email is taken"""
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> Optional[Dict]: ...
+
+    @abstractmethod
+    async def get_user_by_id(self, user_id: str) -> Optional[Dict]: ...
+
+    # ---- Rooms ----
+
+    @abstractmethod
+    async def create_room(self, room_number: str, room_type: str, capacity: int,
+                          price: float, status: str = "available") -> str: ...
+
+    @abstractmethod
+    async def get_all_rooms(self, limit: Optional[int] = None, cursor: Optional[str] = None):
+        """Page of RoomRow ordered by room number"""
+
+    @abstractmethod
+    async def get_room_by_id(self, room_id: str) -> Optional[Dict]: ...
+
+    @abstractmethod
+    async def find_available_rooms(self, start: date, end: date, room_type: Optional[str] = None,
+                                   capacity: Optional[int] = None):
+        """RoomRow list of rooms with no pending/approved booking overlapping [start, end)"""
+
+    @abstractmethod
+    async def update_room(self, room_id: str, updates: Dict): ...
+
+    @abstractmethod
+    async def delete_room(self, room_id: str): ...
+
+    # ---- Bookings ----
+
+    @abstractmethod
+    async def create_booking(self, user_id: str, room_id: str, start_date: str,
+                             end_date: str, duration: int) -> str: ...
+
+    @abstractmethod
+    async def create_booking_request(self, user_id: str, room_id: str, start_date: date,
+                                     end_date: date, duration: int, message: str) -> Optional[str]:
+        """Atomically check availability and create the booking plus its notification"""
+
+    @abstractmethod
+    async def get_user_bookings(self, user_id: str, limit: Optional[int] = None,
+                                cursor: Optional[str] = None, since: Optional[str] = None):
+        """Page of BookingRow, newest first, or the change feed after ``since``"""
+
+    @abstractmethod
+    async def get_booking_by_id(self, booking_id: str) -> Optional[Dict]: ...
+
+    @abstractmethod
+    async def update_booking(self, booking_id: str, updates: Dict): ...
+
+    # ---- Tenants ----
+
+    @abstractmethod
+    async def create_tenant(self, name: str, email: str, phone: str, room_id: str) -> str: ...
+
+    @abstractmethod
+    async def get_all_tenants(self, limit: Optional[int] = None, cursor: Optional[str] = None):
+        """Page of TenantRow ordered by name"""
+
+    # ---- Notifications ----
+
+    @abstractmethod
+    async def create_notification(self, user_id: str, booking_id: str,
+                                  message: str, notification_type: str) -> str: ...
+
+    @abstractmethod
+    async def get_all_notifications(self, limit: Optional[int] = None, cursor: Optional[str] = None,
+                                    since: Optional[str] = None):
+        """Page of NotificationRow with its user, newest first, or the change feed after ``since``"""
+
+    @abstractmethod
+    async def get_user_notifications(self, user_id: str, limit: Optional[int] = None,
+                                     cursor: Optional[str] = None, since: Optional[str] = None): ...
+
+    @abstractmethod
+    async def get_notification_by_id(self, notification_id: str) -> Optional[Dict]: ...
+
+    @abstractmethod
+    async def update_notification(self, notification_id: str, updates: Dict): ...
+
+    @abstractmethod
+    async def approve_booking(self, notification_id: str) -> Optional[Dict]:
+        """Approve notification and booking, mark the room occupied; None if no booking"""
+
+    @abstractmethod
+    async def reject_booking(self, notification_id: str) -> Optional[Dict]: ...
+
+    # ---- Bulk import / export ----
+
+    @abstractmethod
+    async def bulk_create_rooms(self, rows: List[Dict], chunk_size: int = 500) -> Dict: ...
+
+    @abstractmethod
+    async def bulk_create_users(self, rows: List[Dict], chunk_size: int = 500) -> Dict: ...
+
+    @abstractmethod
+    async def bulk_create_tenants(self, rows: List[Dict], chunk_size: int = 500) -> Dict: ...
+
+    @abstractmethod
+    def stream_export(self, kind: str) -> AsyncIterator[Dict]:
+        """Async generator of flat export rows (columns as in database.EXPORTS)"""
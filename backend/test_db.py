@@ -27,10 +27,8 @@ try:
 
     # Test basic query
     print("✅ Testing basic query...")
-    with db.driver.session() as session:
-        result = session.run("RETURN 'Database operational' as status")
-        record = result.single()
-        print(f"📊 Database status: {record['status']}")
+    record = db.query("RETURN 'Database operational' as status")[0]
+    print(f"📊 Database status: {record['status']}")
 
     # Test notifications
     print("🔔 Testing notifications...")
@@ -38,7 +36,7 @@ try:
     print(f"📋 Found {len(notifications)} notifications")
 
     for notif in notifications[:3]:  # Show first 3
-        print(f"  - ID: {notif.get('id')}, Status: {notif.get('status')}, Message: {notif.get('message', '')[:50]}...")
+        print(f"  - ID: {notif.id}, Status: {notif.status}, Message: {(notif.message or '')[:50]}...")
 
     print("✅ Database and notifications test completed successfully!")
 
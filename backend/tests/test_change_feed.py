@@ -0,0 +1,112 @@
+"""Keyset order and ?since= watermarks of the change feeds, against InMemoryRepository"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import database
+import memory_repository
+from memory_repository import InMemoryRepository
+
+
+class Clock:
+    """Stands in for memory_repository._now so tests control updated_at"""
+
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc))
+    monkeypatch.setattr(memory_repository, "_now", clock)
+    return clock
+
+
+async def seed_user_and_room(repo):
+    user_id = await repo.create_user("feed@example.com", "feed", "password123")
+    room_id = await repo.create_room("101", "single", 1, 5000.0)
+    return user_id, room_id
+
+
+async def create_bookings(repo, user_id, room_id, count):
+    return [await repo.create_booking(user_id, room_id, "2024-06-01", "2024-06-02", 1)
+            for _ in range(count)]
+
+
+def test_feed_orders_equal_updated_at_by_id(clock):
+    async def scenario():
+        repo = InMemoryRepository()
+        user_id, room_id = await seed_user_and_room(repo)
+        ids = await create_bookings(repo, user_id, room_id, 5)
+        seen, since = [], ""
+        while True:
+            page = await repo.get_user_bookings(user_id, limit=2, since=since)
+            if not page:
+                return ids, seen
+            seen += [row.id for row in page]
+            since = page.watermark
+
+    ids, seen = asyncio.run(scenario())
+    assert seen == sorted(ids)
+
+
+def test_listing_pages_equal_created_at_by_id_descending(clock):
+    async def scenario():
+        repo = InMemoryRepository()
+        user_id, room_id = await seed_user_and_room(repo)
+        ids = await create_bookings(repo, user_id, room_id, 5)
+        seen, cursor = [], None
+        while True:
+            page = await repo.get_user_bookings(user_id, limit=2, cursor=cursor)
+            seen += [row.id for row in page]
+            if page.next_cursor is None:
+                return ids, seen
+            cursor = page.next_cursor
+
+    ids, seen = asyncio.run(scenario())
+    assert seen == sorted(ids, reverse=True)
+
+
+def test_watermark_holds_back_recent_rows(clock):
+    async def scenario():
+        repo = InMemoryRepository()
+        user_id, room_id = await seed_user_and_room(repo)
+        ids = await create_bookings(repo, user_id, room_id, 2)
+        first = await repo.get_user_bookings(user_id, since="")
+        second = await repo.get_user_bookings(user_id, since=first.watermark)
+        return ids, first, second
+
+    # Rows stamped just now are inside the safety lag
+    clock.now = datetime.now(timezone.utc)
+    ids, first, second = asyncio.run(scenario())
+    assert first.watermark == ""
+    assert sorted(row.id for row in first) == sorted(ids)
+    assert sorted(row.id for row in second) == sorted(ids)
+
+
+def test_late_commit_behind_a_newer_row_is_not_skipped(clock):
+    async def scenario():
+        repo = InMemoryRepository()
+        user_id, room_id = await seed_user_and_room(repo)
+        now = datetime.now(timezone.utc)
+        lag = timedelta(seconds=database.FEED_SAFETY_LAG_SECONDS)
+
+        clock.now = now - 3 * lag
+        settled, = await create_bookings(repo, user_id, room_id, 1)
+        clock.now = now - timedelta(seconds=1)
+        recent, = await create_bookings(repo, user_id, room_id, 1)
+        first = await repo.get_user_bookings(user_id, since="")
+
+        # Stamped before the newest row the poll saw, committed after the poll
+        clock.now = now - lag / 2
+        late, = await create_bookings(repo, user_id, room_id, 1)
+        second = await repo.get_user_bookings(user_id, since=first.watermark)
+        return (settled, recent, late), first, second
+
+    (settled, recent, late), first, second = asyncio.run(scenario())
+    assert [row.id for row in first] == [settled, recent]
+    assert [row.id for row in second] == [late, recent]
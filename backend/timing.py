@@ -0,0 +1,127 @@
+"""
+Per-request phase timings, reported as a Server-Timing header and log fields.
+
+With REQUEST_TIMING enabled, ServerTimingMiddleware gives every HTTP request
+a RequestTimings in a context variable. Code on the request path wraps its
+work in ``with phase("name"):`` (JWT decode, user lookup, bcrypt, each
+database call, JSON encoding). Mapping Neo4j records to rows (temporal
+conversion, the row dataclasses) is its own "convert" phase. It runs inside
+the transaction function, so "db" includes it: query time is db minus
+convert. Time for a repeated phase is summed and its calls are counted. With REQUEST_TIMING off the middleware is not installed,
+and phase() is one ContextVar lookup that returns a shared no-op context
+manager.
+"""
+from contextlib import nullcontext
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, List, Optional
+import logging
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMING = os.getenv("REQUEST_TIMING", "false").lower() in ("1", "true", "yes", "on")
+
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+_NO_PHASE = nullcontext()
+
+
+class RequestTimings:
+    """Accumulated seconds, call count and labels per phase for one request"""
+
+    __slots__ = ("started", "phases")
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.phases: Dict[str, List] = {}
+
+    def add(self, name: str, seconds: float, label: Optional[str] = None):
+        entry = self.phases.get(name)
+        if entry is None:
+            entry = self.phases[name] = [0.0, 0, []]
+        entry[0] += seconds
+        entry[1] += 1
+        if label and label not in entry[2]:
+            entry[2].append(label)
+
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+    def header(self) -> str:
+        """Server-Timing value, e.g. ``db;dur=4.1;desc="get_user_by_email", total;dur=5.0``"""
+        metrics = []
+        for name, (seconds, calls, labels) in self.phases.items():
+            metric = f"{name};dur={seconds * 1e3:.2f}"
+            description = " ".join(labels) if labels else (f"{calls} calls" if calls > 1 else "")
+            if description:
+                metric += f';desc="{description}"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={self.elapsed() * 1e3:.2f}")
+        return ", ".join(metrics)
+
+    def fields(self) -> Dict[str, float]:
+        return {name: round(seconds * 1e3, 3) for name, (seconds, _, _) in self.phases.items()}
+
+
+class _Phase:
+    __slots__ = ("timings", "name", "label", "started")
+
+    def __init__(self, timings: RequestTimings, name: str, label: Optional[str]):
+        self.timings = timings
+        self.name = name
+        self.label = label
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, perf_counter() - self.started, self.label)
+        return False
+
+
+def phase(name: str, label: Optional[str] = None):
+    """Context manager timing one phase of the current request (no-op outside one)"""
+    timings = _current.get()
+    return _NO_PHASE if timings is None else _Phase(timings, name, label)
+
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware: collects phase timings, sets Server-Timing, logs a summary"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Streamed responses report the phases completed before their first byte
+                message["headers"] = [*message.get("headers", []),
+                                      (b"server-timing", timings.header().encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            total_ms = round(timings.elapsed() * 1e3, 3)
+            fields = timings.fields()
+            logger.info(
+                f"⏱️ {scope['method']} {scope['path']} {status_code} {total_ms:.1f}ms "
+                + " ".join(f"{name}={ms:.1f}" for name, ms in fields.items()),
+                extra={"method": scope["method"], "path": scope["path"], "status": status_code,
+                       "duration_ms": total_ms, "timings": fields},
+            )
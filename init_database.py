@@ -1,7 +1,16 @@
 #!/usr/bin/env python3
 """
-Script to initialize the boardinghouse database with sample data
+Script to initialize the boardinghouse database with sample data,
+or bulk-load rooms, users and tenants from CSV / JSONL files.
+
+Usage:
+    python init_database.py
+    python init_database.py --rooms rooms.csv --users users.jsonl --tenants tenants.csv
+
+Rows are written in UNWIND batches (BULK_CHUNK_SIZE per transaction) and rows
+that already exist are skipped, so the script is safe to re-run.
 """
+import argparse
 import os
 import sys
 from dotenv import load_dotenv
@@ -9,14 +18,49 @@ from dotenv import load_dotenv
 # Add backend directory to path
 sys.path.append('./backend')
 
-from database import Neo4jConnection
-from auth import get_password_hash
+from database import Neo4jConnection, BULK_CHUNK_SIZE
+from bulk_import import ImportReport, import_format, iter_rows, chunked
 
 # Load environment variables
 load_dotenv()
 
-def initialize_database():
-    """Initialize database with sample data"""
+SAMPLE_ROOMS = [
+    {"room_number": "101", "room_type": "Single", "capacity": 1, "price": 5000.00},
+    {"room_number": "102", "room_type": "Single", "capacity": 1, "price": 5000.00},
+    {"room_number": "201", "room_type": "Double", "capacity": 2, "price": 8000.00},
+    {"room_number": "202", "room_type": "Double", "capacity": 2, "price": 8000.00},
+    {"room_number": "301", "room_type": "Family", "capacity": 4, "price": 12000.00},
+    {"room_number": "302", "room_type": "Family", "capacity": 4, "price": 12000.00},
+]
+
+SAMPLE_USERS = [
+    {"email": "john.doe@example.com", "username": "john_doe", "password": "password123", "role": "user"},
+    {"email": "jane.smith@example.com", "username": "jane_smith", "password": "password123", "role": "user"},
+]
+
+
+def print_report(label, result):
+    print(
+        f"✅ {label}: {result['created']} created, {result['skipped']} already present"
+        + (f", {result['invalid']} invalid" if result.get("invalid") else "")
+        + f" ({result['rows_per_second']} rows/sec)"
+    )
+    for error in result.get("errors", []):
+        print(f"   ⚠️ {error}")
+
+
+def import_file(db, kind, path):
+    """Stream a CSV/JSONL file into the database chunk by chunk"""
+    bulk_create = getattr(db, f"bulk_create_{kind}")
+    report = ImportReport()
+    with open(path, encoding="utf-8-sig", newline="") as lines:
+        for chunk in chunked(iter_rows(kind, lines, import_format(path), report), BULK_CHUNK_SIZE):
+            report.add_result(bulk_create(chunk))
+    print_report(f"{kind.capitalize()} from {path}", report.as_dict())
+
+
+def initialize_database(rooms_file=None, users_file=None, tenants_file=None):
+    """Initialize database with the admin user plus sample data or the given files"""
     # Connect to database
     db = Neo4jConnection(
         uri=os.getenv("NEO4J_URI"),
@@ -36,60 +80,32 @@ def initialize_database():
         print("👑 Creating admin user...")
         admin_email = os.getenv("DEFAULT_ADMIN_EMAIL", "admin@boardinghouse.com")
         admin_password = os.getenv("DEFAULT_ADMIN_PASSWORD", "admin123")
+        print_report("Admin user", db.bulk_create_users([
+            {"email": admin_email, "username": "admin", "password": admin_password, "role": "admin"}
+        ]))
 
-        existing_admin = db.get_user_by_email(admin_email)
-        if not existing_admin:
-            hashed_password = get_password_hash(admin_password)
-            admin_id = db.create_user(admin_email, "admin", hashed_password, "admin")
-            print(f"✅ Admin user created: {admin_email} / {admin_password}")
+        print("🏠 Creating rooms...")
+        if rooms_file:
+            import_file(db, "rooms", rooms_file)
         else:
-            print(f"✅ Admin user already exists: {admin_email}")
-
-        # Create sample rooms
-        print("🏠 Creating sample rooms...")
-
-        # Check if rooms already exist
-        existing_rooms = db.get_all_rooms()
-        if not existing_rooms:
-            # Create sample rooms
-            rooms_data = [
-                {"room_number": "101", "room_type": "Single", "capacity": 1, "price": 5000.00},
-                {"room_number": "102", "room_type": "Single", "capacity": 1, "price": 5000.00},
-                {"room_number": "201", "room_type": "Double", "capacity": 2, "price": 8000.00},
-                {"room_number": "202", "room_type": "Double", "capacity": 2, "price": 8000.00},
-                {"room_number": "301", "room_type": "Family", "capacity": 4, "price": 12000.00},
-                {"room_number": "302", "room_type": "Family", "capacity": 4, "price": 12000.00},
-            ]
-
-            for room_data in rooms_data:
-                room_id = db.create_room(**room_data)
-                print(f"✅ Created room {room_data['room_number']} - {room_data['room_type']}")
-
-            print(f"✅ Created {len(rooms_data)} sample rooms")
+            print_report("Sample rooms", db.bulk_create_rooms(SAMPLE_ROOMS))
+
+        print("👤 Creating users...")
+        if users_file:
+            import_file(db, "users", users_file)
         else:
-            print(f"✅ Rooms already exist: {len(existing_rooms)} rooms found")
-
-        # Create sample users
-        print("👤 Creating sample users...")
-        sample_users = [
-            {"email": "john.doe@example.com", "username": "john_doe", "password": "password123", "role": "user"},
-            {"email": "jane.smith@example.com", "username": "jane_smith", "password": "password123", "role": "user"},
-        ]
-
-        for user_data in sample_users:
-            existing_user = db.get_user_by_email(user_data["email"])
-            if not existing_user:
-                hashed_password = get_password_hash(user_data["password"])
-                user_id = db.create_user(user_data["email"], user_data["username"], hashed_password, user_data["role"])
-                print(f"✅ Created user: {user_data['email']}")
-            else:
-                print(f"✅ User already exists: {user_data['email']}")
+            print_report("Sample users", db.bulk_create_users(SAMPLE_USERS))
+
+        if tenants_file:
+            print("👥 Creating tenants...")
+            import_file(db, "tenants", tenants_file)
 
         print("🎉 Database initialization complete!")
         print("\n📋 Sample Login Credentials:")
         print(f"Admin: {admin_email} / {admin_password}")
-        print("Users: john.doe@example.com / password123")
-        print("       jane.smith@example.com / password123")
+        if not users_file:
+            print("Users: john.doe@example.com / password123")
+            print("       jane.smith@example.com / password123")
 
     except Exception as e:
         print(f"❌ Error initializing database: {e}")
@@ -101,8 +117,14 @@ def initialize_database():
     return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Initialize the boardinghouse database")
+    parser.add_argument("--rooms", help="CSV/JSONL file of rooms (room_number, room_type, capacity, price[, status])")
+    parser.add_argument("--users", help="CSV/JSONL file of users (email, username, password[, role])")
+    parser.add_argument("--tenants", help="CSV/JSONL file of tenants (name, email, phone, room_id or room_number)")
+    args = parser.parse_args()
+
     print("🚀 Initializing Boardinghouse Database...")
-    success = initialize_database()
+    success = initialize_database(args.rooms, args.users, args.tenants)
     if success:
         print("✅ Database initialized successfully!")
     else:
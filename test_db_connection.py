@@ -25,10 +25,8 @@ def test_neo4j_connection():
         print("✅ Database connection successful")
 
         # Test basic query
-        with db.driver.session() as session:
-            result = session.run("RETURN 'Database operational' as status")
-            record = result.single()
-            print(f"✅ Basic query result: {record['status']}")
+        record = db.query("RETURN 'Database operational' as status")[0]
+        print(f"✅ Basic query result: {record['status']}")
 
         # Test creating constraints
         print("🔒 Creating database constraints...")
@@ -56,15 +54,11 @@ def test_neo4j_connection():
         # Test retrieving all users
         print("📋 Retrieving all users...")
         # Let's check if there's a method to get all users (we might need to add this)
-        with db.driver.session() as session:
-            result = session.run("MATCH (u:User) RETURN u")
-            users = []
-            for record in result:
-                user_data = dict(record["u"])
-                users.append(user_data)
-                print(f"  - User: {user_data.get('email', 'N/A')}")
-
-            print(f"✅ Found {len(users)} users in database")
+        users = [record["u"] for record in db.query("MATCH (u:User) RETURN u")]
+        for user_data in users:
+            print(f"  - User: {user_data.get('email', 'N/A')}")
+
+        print(f"✅ Found {len(users)} users in database")
 
         db.close()
         print("✅ Database connection closed")